@@ -1,18 +1,118 @@
 #!/usr/bin/env python3
 
 import os
+import re
+import json
+import stat
 import subprocess
+import threading
 import time
+from collections import deque
 from typing import Dict, List, Callable, Optional
-from datetime import datetime
-from loguru import logger
+
+class _LazyLogger:
+    """Placeholder that imports loguru on first use, then replaces itself"""
+    
+    def __getattr__(self, name):
+        global logger
+        from loguru import logger
+        return getattr(logger, name)
+
+logger = _LazyLogger()
+
+_timestamp_cache = threading.local()
+
+def _iso_now() -> str:
+    """Local ISO 8601 timestamp, same format as datetime.now().isoformat()
+    
+    The date/time prefix is formatted once per second per thread; later
+    calls in the same second only append the microseconds.
+    """
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    cache = _timestamp_cache
+    if getattr(cache, "seconds", None) != seconds:
+        cache.seconds = seconds
+        cache.prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(seconds))
+    
+    micros = nanos // 1000
+    return f"{cache.prefix}.{micros:06d}" if micros else cache.prefix
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    from rapidfuzz import process, fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    process = None
+    fuzz = None
+    RAPIDFUZZ_AVAILABLE = False
+
+def build_keyword_matcher(keywords: Dict[str, object]) -> Callable[[str], List]:
+    """Build a one-pass scanner for every keyword of a table
+    
+    Keywords match case-insensitively and only at the start of a word, so
+    "ack" finds "ack that" and "acknowledged" but not "attack" or "hack".
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, else
+    one compiled regex alternation.
+    
+    Args:
+        keywords: Keyword -> value to report when it is found
+        
+    Returns:
+        Function mapping text to the values of the keywords found in it
+    """
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for keyword, value in keywords.items():
+            automaton.add_word(keyword.lower(), (len(keyword), value))
+        automaton.make_automaton()
+        
+        def find(text: str) -> List:
+            text = text.lower()
+            found = []
+            for end, (length, value) in automaton.iter(text):
+                start = end - length + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    found.append(value)
+            return found
+        return find
+    
+    # Longest first so "acknowledge" is not consumed as "ack"
+    lookup = {keyword.lower(): value for keyword, value in keywords.items()}
+    pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, sorted(lookup, key=len, reverse=True))) + ")")
+    return lambda text: [lookup[match.group(0)] for match in pattern.finditer(text.lower())]
+
+# Approximate matching compares whole words with fuzz.ratio: a window of
+# the transcript must be this similar to a trigger or keyword, and this long
+APPROX_SCORE_CUTOFF = 90
+APPROX_MIN_LENGTH = 4
+
+# Replies that settle a pending confirmation, and how long one stays open
+CONFIRM_RE = re.compile(r"\b(?:confirm(?:ed)?|yes|proceed)\b")
+CANCEL_RE = re.compile(r"\b(?:cancel|abort)\b")
+CONFIRMATION_TIMEOUT = 60
 
 class CommandEngine:
     """Handles voice command processing and execution"""
     
-    def __init__(self, scripts_dir: str = "scripts"):
+    def __init__(self, scripts_dir: str = "scripts", max_history: int = 10000):
         self.scripts_dir = scripts_dir
-        self.command_history = []
+        # Bounded in-memory audit ring; the loguru sink keeps the full trail
+        self.command_history = deque(maxlen=max_history)
+        
+        # Snapshot the environment once; scripts only add CVE_ID/TIMESTAMP on top
+        self._base_env = dict(os.environ)
+        
+        # Acknowledgment log handle, opened on first acknowledgment
+        self._ack_fh = None
+        
+        # cve_id -> (matched command, monotonic deadline, utterance) awaiting "confirm"
+        self._pending_confirmation: Dict[Optional[str], tuple] = {}
         
         # Whitelisted commands mapping
         self.command_whitelist = {
@@ -43,6 +143,34 @@ class CommandEngine:
             }
         }
         
+        # Fuzzy matching for common variations
+        self._fuzzy_map = {
+            "patch": "start patching",
+            "quarantine": "quarantine servers", 
+            "isolate": "quarantine servers",
+            "acknowledge": "acknowledge incident",
+            "ack": "acknowledge incident",
+            "shutdown": "emergency shutdown",
+            "status": "status report",
+            "report": "status report"
+        }
+        
+        # Optional embedding fallback for paraphrases the matchers miss
+        self.semantic_cache = None
+        if os.getenv("SEMANTIC_COMMANDS", "false").lower() == "true":
+            try:
+                from semantic_cache import SemanticCommandCache
+                self.semantic_cache = SemanticCommandCache(
+                    path=os.getenv("SEMANTIC_COMMANDS_PATH", "cache/command_intents"),
+                    threshold=float(os.getenv("SEMANTIC_COMMANDS_THRESHOLD", 0.92))
+                )
+            except ImportError:
+                logger.warning("numpy/sentence-transformers not installed, semantic command matching disabled")
+        
+        self._build_lookup_tables()
+        self._build_matcher()
+        self._help_response = self._build_help_response()
+        
         # Ensure scripts directory exists
         os.makedirs(self.scripts_dir, exist_ok=True)
     
@@ -63,16 +191,59 @@ class CommandEngine:
         # Log the command
         self._log_command(command_text, cve_id)
         
+        # Answer to an earlier "did you mean" prompt; any reply other than
+        # "confirm" drops the guess and is matched as a command of its own
+        pending = self._pending_confirmation.pop(cve_id, None)
+        if pending is not None and time.monotonic() < pending[1]:
+            if CONFIRM_RE.search(command_text):
+                matched_command = pending[0]
+                logger.info(f"Command confirmed: {matched_command['trigger']}")
+                self._learn(pending[2], matched_command["trigger"])
+                return self._execute_command(matched_command, command_text, cve_id)
+        else:
+            pending = None
+        
         # Find matching command
         matched_command = self._match_command(command_text)
         
         if not matched_command:
+            if pending is not None and CANCEL_RE.search(command_text):
+                logger.info(f"Command cancelled: {pending[0]['trigger']}")
+                return f"Cancelled {pending[0]['trigger']}."
             logger.warning(f"No matching command found for: '{command_text}'")
             return self._get_help_response()
         
+        # Approximate and semantic guesses only run after an explicit "confirm"
+        if matched_command.get("approximate"):
+            trigger = matched_command["trigger"]
+            logger.info(f"Awaiting confirmation for: {trigger}")
+            self._pending_confirmation[cve_id] = (matched_command, time.monotonic() + CONFIRMATION_TIMEOUT, command_text)
+            return f"Did you mean {trigger}? Say confirm to proceed or cancel to abort."
+        
         # Execute the command
         return self._execute_command(matched_command, command_text, cve_id)
     
+    def _build_lookup_tables(self):
+        """Precompute the per-call lookup tables used by _match_command"""
+        # Map every matchable token to (kind, trigger); direct triggers
+        # override fuzzy keywords that happen to share the same text
+        self._token_map = {keyword: ("fuzzy", trigger) for keyword, trigger in self._fuzzy_map.items()}
+        self._token_map.update((trigger, ("direct", trigger)) for trigger in self.command_whitelist)
+        # Approximate-match candidates grouped by word count, so each is only
+        # compared with transcript windows of the same number of words
+        self._phrases_by_size: Dict[int, List[str]] = {}
+        for phrase in list(self.command_whitelist) + list(self._fuzzy_map):
+            self._phrases_by_size.setdefault(len(phrase.split()), []).append(phrase)
+        if self.semantic_cache is not None:
+            self.semantic_cache.set_anchors({**self._fuzzy_map, **{t: t for t in self.command_whitelist}})
+    
+    def _build_matcher(self):
+        """Build a single-pass matcher over all triggers and fuzzy keywords
+        
+        Called from __init__ and whenever the whitelist changes.
+        """
+        self._find_tokens = build_keyword_matcher({token: token for token in self._token_map})
+    
     def _match_command(self, command_text: str) -> Optional[Dict]:
         """Find the best matching whitelisted command
         
@@ -82,29 +253,96 @@ class CommandEngine:
         Returns:
             Matching command configuration or None
         """
-        # Direct match first
-        for trigger, config in self.command_whitelist.items():
-            if trigger in command_text:
-                logger.info(f"Direct match found: '{trigger}'")
-                return {"trigger": trigger, **config}
+        matched = self._match_exact(command_text)
+        if matched:
+            self._learn(command_text, matched["trigger"])
+            return matched
+        
+        matched = self._match_approximate(command_text)
+        
+        if not matched and self.semantic_cache is not None:
+            try:
+                trigger = self.semantic_cache.lookup(command_text)
+                if trigger:
+                    matched = {"trigger": trigger, **self.command_whitelist[trigger], "approximate": True}
+            except Exception as e:
+                logger.warning(f"Semantic command matching failed: {e}")
+        
+        return matched
+    
+    def _learn(self, command_text: str, trigger: str):
+        """Teach the semantic cache an utterance from an exact or confirmed match
         
-        # Fuzzy matching for common variations
-        fuzzy_matches = {
-            "patch": "start patching",
-            "quarantine": "quarantine servers", 
-            "isolate": "quarantine servers",
-            "acknowledge": "acknowledge incident",
-            "ack": "acknowledge incident",
-            "shutdown": "emergency shutdown",
-            "status": "status report",
-            "report": "status report"
-        }
+        Guesses are never learned, so a wrong guess can't reinforce itself.
+        """
+        if self.semantic_cache is None:
+            return
+        try:
+            self.semantic_cache.add(command_text, trigger)
+        except Exception as e:
+            logger.warning(f"Semantic command learning failed: {e}")
+    
+    def _match_approximate(self, command_text: str) -> Optional[Dict]:
+        """Approximate matching for misrecognized transcripts ("start patchin")
+        
+        Each run of whole words is scored with fuzz.ratio against the
+        triggers and keywords with the same word count; a short input never
+        matches as a substring of a longer trigger. The result is flagged
+        "approximate" so it is confirmed before it runs.
+        
+        Args:
+            command_text: Input command text
+            
+        Returns:
+            Matching command configuration or None
+        """
+        if not RAPIDFUZZ_AVAILABLE or len(command_text) < APPROX_MIN_LENGTH:
+            return None
+        
+        words = command_text.split()
+        best = None
+        for size, phrases in self._phrases_by_size.items():
+            for i in range(len(words) - size + 1):
+                window = " ".join(words[i:i + size])
+                if len(window) < APPROX_MIN_LENGTH:
+                    continue
+                hit = process.extractOne(window, phrases, scorer=fuzz.ratio, score_cutoff=APPROX_SCORE_CUTOFF)
+                if hit and (best is None or hit[1] > best[1]):
+                    best = hit
+        
+        if best is None:
+            return None
+        
+        keyword, score = best[0], best[1]
+        trigger = keyword if keyword in self.command_whitelist else self._fuzzy_map[keyword]
+        logger.info(f"Approximate match found: '{keyword}' -> '{trigger}' (score {score:.0f})")
+        return {"trigger": trigger, **self.command_whitelist[trigger], "approximate": True}
+    
+    def _match_exact(self, command_text: str) -> Optional[Dict]:
+        """Find a whitelisted trigger or fuzzy keyword contained in the text
         
-        for keyword, trigger in fuzzy_matches.items():
-            if keyword in command_text:
-                config = self.command_whitelist[trigger]
-                logger.info(f"Fuzzy match found: '{keyword}' -> '{trigger}'")
-                return {"trigger": trigger, **config}
+        Args:
+            command_text: Input command text
+            
+        Returns:
+            Matching command configuration or None
+        """
+        tokens = self._find_tokens(command_text)
+        
+        # Direct match first, otherwise the first fuzzy keyword seen
+        fuzzy_hit = None
+        for token in tokens:
+            kind, trigger = self._token_map[token]
+            if kind == "direct":
+                logger.info(f"Direct match found: '{trigger}'")
+                return {"trigger": trigger, **self.command_whitelist[trigger]}
+            if fuzzy_hit is None:
+                fuzzy_hit = (token, trigger)
+        
+        if fuzzy_hit:
+            keyword, trigger = fuzzy_hit
+            logger.info(f"Fuzzy match found: '{keyword}' -> '{trigger}'")
+            return {"trigger": trigger, **self.command_whitelist[trigger]}
         
         return None
     
@@ -151,20 +389,26 @@ class CommandEngine:
         Returns:
             Execution result message
         """
-        if not os.path.exists(script_path):
+        # Single stat call covers both the existence and executable checks
+        try:
+            st = os.stat(script_path)
+        except FileNotFoundError:
+            st = None
+        
+        if st is None or not stat.S_ISREG(st.st_mode):
             logger.error(f"Script not found: {script_path}")
             return f"Script {script_path} not found. Please check configuration."
         
-        if not os.access(script_path, os.X_OK):
+        if not st.st_mode & 0o111:
             logger.error(f"Script not executable: {script_path}")
             return f"Script {script_path} is not executable."
         
         try:
             # Set environment variables for the script
-            env = os.environ.copy()
+            env = self._base_env.copy()
             if cve_id:
                 env["CVE_ID"] = cve_id
-            env["TIMESTAMP"] = datetime.now().isoformat()
+            env["TIMESTAMP"] = _iso_now()
             
             logger.info(f"Executing script: {script_path}")
             
@@ -201,7 +445,7 @@ class CommandEngine:
         Returns:
             Acknowledgment confirmation
         """
-        timestamp = datetime.now().isoformat()
+        timestamp = _iso_now()
         
         # Log acknowledgment
         ack_message = f"Incident acknowledged at {timestamp}"
@@ -211,12 +455,12 @@ class CommandEngine:
         logger.info(ack_message)
         
         # Write to acknowledgment log
-        ack_file = os.path.join("logs", "acknowledgments.log")
-        os.makedirs("logs", exist_ok=True)
-        
         try:
-            with open(ack_file, "a") as f:
-                f.write(f"{timestamp}: {ack_message}\n")
+            if self._ack_fh is None:
+                os.makedirs("logs", exist_ok=True)
+                # Line-buffered so each acknowledgment is flushed as it is written
+                self._ack_fh = open(os.path.join("logs", "acknowledgments.log"), "a", buffering=1)
+            self._ack_fh.write(f"{timestamp}: {ack_message}\n")
         except Exception as e:
             logger.error(f"Failed to write acknowledgment log: {e}")
         
@@ -230,7 +474,7 @@ class CommandEngine:
             cve_id: Associated CVE ID
         """
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _iso_now(),
             "command": command_text,
             "cve_id": cve_id,
             "source": "voice_command"
@@ -240,7 +484,15 @@ class CommandEngine:
         logger.info(f"Command logged: {log_entry}")
     
     def _get_help_response(self) -> str:
-        """Generate help response for unknown commands
+        """Get the help response for unknown commands
+        
+        Returns:
+            Help message listing available commands
+        """
+        return self._help_response
+    
+    def _build_help_response(self) -> str:
+        """Build the help response from the current whitelist
         
         Returns:
             Help message listing available commands
@@ -256,7 +508,21 @@ class CommandEngine:
         Returns:
             List of command log entries
         """
-        return self.command_history.copy()
+        return list(self.command_history)
+    
+    def close(self):
+        """Save learned utterances and close the acknowledgment log if it was opened"""
+        if self.semantic_cache is not None:
+            self.semantic_cache.save()
+        if self._ack_fh is not None:
+            self._ack_fh.close()
+            self._ack_fh = None
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
     
     def add_custom_command(self, trigger: str, script_path: str, description: str = "Custom command"):
         """Add a custom command to the whitelist
@@ -271,6 +537,9 @@ class CommandEngine:
             "description": description,
             "requires_confirmation": True  # Custom commands require confirmation by default
         }
+        self._build_lookup_tables()
+        self._build_matcher()
+        self._help_response = self._build_help_response()
         
         logger.info(f"Added custom command: '{trigger}' -> {script_path}")
 
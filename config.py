@@ -2,14 +2,36 @@
 
 import os
 from typing import Dict, Any
-from dotenv import load_dotenv
 
 class VoiceAlertConfig:
     """Configuration management for VoiceAlert System"""
     
+    # Known settings are plain attributes so hot loops avoid a dict lookup
+    __slots__ = (
+        "openai_api_key", "elevenlabs_api_key",
+        "engineer_phone", "voice_id", "use_mock_voice",
+        "poll_interval_minutes", "target_cve", "cve_scan_timeout",
+        "llm_model", "llm_max_tokens", "llm_temperature",
+        "log_level", "scripts_dir", "logs_dir",
+        "max_call_duration", "command_timeout", "enable_emergency_shutdown",
+        "health_check_interval", "webhook_url",
+        "_extra",
+    )
+    _FIELDS = __slots__[:-1]  # in declaration order, for get_all()
+    _FIELD_SET = frozenset(_FIELDS)  # hashed membership for get()
+    
     def __init__(self, config_file: str = ".env"):
+        from dotenv import load_dotenv
         load_dotenv(config_file)
-        self._config = self._load_config()
+        
+        # Settings without a slot land in _extra and stay reachable via get()
+        self._extra = {}
+        for key, value in self._load_config().items():
+            if key in self._FIELD_SET:
+                setattr(self, key, value)
+            else:
+                self._extra[key] = value
+        
         self._validate_config()
     
     def _load_config(self) -> Dict[str, Any]:
@@ -58,7 +80,7 @@ class VoiceAlertConfig:
         
         missing = []
         for key in required_for_production:
-            if not self._config.get(key):
+            if not self.get(key):
                 missing.append(key.upper())
         
         if missing:
@@ -67,11 +89,14 @@ class VoiceAlertConfig:
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value"""
-        return self._config.get(key, default)
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        return self._extra.get(key, default)
     
     def get_all(self) -> Dict[str, Any]:
         """Get all configuration values (excluding sensitive data)"""
-        config_copy = self._config.copy()
+        config_copy = {key: getattr(self, key) for key in self._FIELDS}
+        config_copy.update(self._extra)
         
         # Mask sensitive values
         sensitive_keys = ["openai_api_key", "elevenlabs_api_key"]
@@ -84,7 +109,7 @@ class VoiceAlertConfig:
     def is_production_ready(self) -> bool:
         """Check if configuration is ready for production use"""
         required = ["engineer_phone", "openai_api_key"]
-        return all(self._config.get(key) for key in required)
+        return all(self.get(key) for key in required)
 
 # Global config instance
 config = VoiceAlertConfig()
\ No newline at end of file
@@ -1,20 +1,159 @@
 #!/usr/bin/env python3
 
+import os
 import subprocess
 import json
+import threading
 import time
 from typing import List, Dict, Optional
-from datetime import datetime
-from loguru import logger
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    ijson = None
+    IJSON_AVAILABLE = False
+
+class _LazyLogger:
+    """Defers the loguru import until the scanner first logs something"""
+    
+    def __getattr__(self, name):
+        global logger
+        from loguru import logger
+        return getattr(logger, name)
+
+logger = _LazyLogger()
+
+_MISSING = object()
+
+def _score_from(value):
+    """Return a numeric score from a bare number or a CVSS dict, else None"""
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, dict):
+        return value.get("baseScore") or value.get("cvss_score")
+    return None
 
 class CVEScanner:
     """Handles CVE scanning using CVELib CLI"""
     
     def __init__(self, poll_interval_minutes: int = 5):
         self.poll_interval = poll_interval_minutes * 60
+        self._cve_api = None
+        
+        # Normalized CVE info keyed by CVE ID, oldest entries evicted first
+        self._info_cache: Dict[str, Dict] = {}
+        self._info_cache_size = 1024
+    
+    def _get_cve_api(self):
+        """Get an in-process CVELib API client, if the library and credentials are available
+        
+        Uses the same environment variables as the CVELib CLI. Returns None
+        when the CLI shell-out should be used instead.
+        """
+        if self._cve_api is not None:
+            return self._cve_api
+        
+        username = os.getenv("CVE_USER")
+        org = os.getenv("CVE_ORG")
+        api_key = os.getenv("CVE_API_KEY")
+        if not (username and org and api_key):
+            return None
+        
+        try:
+            from cvelib.cve_api import CveApi
+        except ImportError:
+            return None
+        
+        self._cve_api = CveApi(
+            username=username,
+            org=org,
+            api_key=api_key,
+            env=os.getenv("CVE_ENVIRONMENT", "prod")
+        )
+        return self._cve_api
+    
+    def _fetch_via_library(self, cve_api, since_minutes: int) -> List[Dict]:
+        """Fetch new CVEs by calling CVELib directly instead of spawning the CLI
+        
+        list_cves only returns ID reservation records (no description or
+        metrics), so each published ID is then fetched as a full CVE JSON 5
+        record and flattened into the fields extract_cve_info reads.
+        """
+        since = datetime.now(timezone.utc) - timedelta(minutes=since_minutes)
+        logger.info(f"Querying CVELib API for CVEs since {since.isoformat()}")
+        
+        cve_ids = [entry["cve_id"] for entry in cve_api.list_cves(state="published", reserved_gt=since)]
+        
+        if not cve_ids:
+            logger.info("No new CVEs found")
+            return []
+        
+        def fetch_record(cve_id):
+            try:
+                return self._flatten_cve_record(cve_api.show_cve_record(cve_id), cve_id)
+            except Exception as e:
+                logger.warning(f"Failed to fetch CVE record {cve_id}: {e}")
+                return None
+        
+        # One request per record; overlap them instead of paying each round trip in turn
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            cves = [cve for cve in pool.map(fetch_record, cve_ids) if cve is not None]
+        
+        logger.info(f"Found {len(cves)} new CVEs")
+        return cves
+    
+    @staticmethod
+    def _flatten_cve_record(record: Dict, cve_id: str) -> Dict:
+        """Map a CVE JSON 5 record onto the flat fields of the CLI output"""
+        metadata = record.get("cveMetadata", {})
+        cna = record.get("containers", {}).get("cna", {})
+        
+        cve = {
+            "cve_id": metadata.get("cveId", cve_id),
+            "published_date": metadata.get("datePublished"),
+            "references": [ref["url"] for ref in cna.get("references", []) if ref.get("url")],
+            "affected_products": [
+                " ".join(filter(None, (affected.get("vendor"), affected.get("product"))))
+                for affected in cna.get("affected", [])
+            ]
+        }
+        
+        description = next(
+            (d.get("value") for d in cna.get("descriptions", []) if d.get("lang", "").startswith("en")),
+            None
+        )
+        if description:
+            cve["description"] = description
+        
+        # Newest CVSS version the CNA provided
+        cvss = next(
+            (metric[version] for metric in cna.get("metrics", [])
+             for version in ("cvssV4_0", "cvssV3_1", "cvssV3_0", "cvssV2_0") if version in metric),
+            None
+        )
+        if cvss:
+            if cvss.get("baseScore") is not None:
+                cve["cvss_score"] = cvss["baseScore"]
+            if cvss.get("baseSeverity"):
+                cve["severity"] = cvss["baseSeverity"]
+        
+        return cve
         
     def fetch_new_cves(self, since_minutes: int = None) -> List[Dict]:
-        """Fetch new CVEs using CVELib CLI
+        """Fetch new CVEs using CVELib
+        
+        Calls the CVELib Python API in-process when CVE Services credentials
+        are configured, otherwise shells out to the CVELib CLI.
         
         Args:
             since_minutes: How far back to look for new CVEs
@@ -25,22 +164,30 @@ class CVEScanner:
         try:
             if since_minutes is None:
                 since_minutes = self.poll_interval // 60
+            
+            cve_api = self._get_cve_api()
+            if cve_api is not None:
+                return self._fetch_via_library(cve_api, since_minutes)
                 
-            cmd = ["cve", "search", "--new", f"--since", f"{since_minutes}m", "--format", "json"]
+            cmd = self._build_search_cmd(since_minutes)
             logger.info(f"Running CVELib command: {' '.join(cmd)}")
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            # Keep stdout as bytes so the JSON parser can decode it directly
+            result = subprocess.run(cmd, capture_output=True, timeout=60)
             
             if result.returncode != 0:
-                logger.error(f"CVELib command failed: {result.stderr}")
+                logger.error(f"CVELib command failed: {result.stderr.decode(errors='replace')}")
                 return []
                 
             if not result.stdout.strip():
                 logger.info("No new CVEs found")
                 return []
                 
-            # Parse JSON output
-            cves = json.loads(result.stdout)
+            # Parse JSON output (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+            if ORJSON_AVAILABLE:
+                cves = orjson.loads(result.stdout)
+            else:
+                cves = json.loads(result.stdout)
             logger.info(f"Found {len(cves)} new CVEs")
             
             return cves if isinstance(cves, list) else [cves]
@@ -55,6 +202,81 @@ class CVEScanner:
             logger.error(f"Unexpected error in CVE scanning: {e}")
             return []
     
+    def _build_search_cmd(self, since_minutes: int) -> List[str]:
+        """Build the CVELib CLI search command"""
+        return ["cve", "search", "--new", "--since", f"{since_minutes}m", "--format", "json"]
+    
+    def find_target_streaming(self, target_id: str = "CVE-2025-55182", since_minutes: int = None) -> Optional[Dict]:
+        """Find a specific CVE, stopping as soon as it appears in the results
+        
+        Streams the CVELib CLI output through ijson instead of parsing the
+        whole list first. Falls back to fetch_new_cves when ijson is missing.
+        
+        Args:
+            target_id: CVE ID to search for
+            since_minutes: How far back to look for new CVEs
+            
+        Returns:
+            CVE dictionary if found, None otherwise
+        """
+        if since_minutes is None:
+            since_minutes = self.poll_interval // 60
+        
+        cve_api = self._get_cve_api()
+        if cve_api is not None:
+            try:
+                since = datetime.now(timezone.utc) - timedelta(minutes=since_minutes)
+                for entry in cve_api.list_cves(state="published", reserved_gt=since):
+                    if entry.get("cve_id") == target_id:
+                        # list_cves entries are ID reservations; fetch the full record
+                        logger.info(f"Found target CVE: {target_id}")
+                        return self._flatten_cve_record(cve_api.show_cve_record(target_id), target_id)
+                logger.warning(f"Target CVE {target_id} not found in results")
+                return None
+            except Exception as e:
+                logger.warning(f"CVELib API search failed, falling back to CLI: {e}")
+        
+        if not IJSON_AVAILABLE:
+            return self.get_target_cve(self.fetch_new_cves(since_minutes), target_id)
+        
+        cmd = self._build_search_cmd(since_minutes)
+        logger.info(f"Streaming CVELib command: {' '.join(cmd)}")
+        
+        try:
+            # Unbuffered so each read returns whatever the CLI has written so far
+            proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0
+            )
+        except Exception as e:
+            logger.error(f"Failed to run CVELib command: {e}")
+            return None
+        
+        # Same 60 second budget as fetch_new_cves
+        watchdog = threading.Timer(60, proc.kill)
+        watchdog.start()
+        
+        try:
+            for cve in ijson.items(proc.stdout, "item", use_float=True):
+                if cve.get("cve_id") == target_id or cve.get("id") == target_id:
+                    logger.info(f"Found target CVE: {target_id}")
+                    return cve
+        except ijson.JSONError as e:
+            logger.error(f"Failed to parse CVELib JSON output: {e}")
+            return None
+        finally:
+            watchdog.cancel()
+            if proc.poll() is None:
+                proc.terminate()
+            proc.stdout.close()
+            proc.wait()
+        
+        logger.warning(f"Target CVE {target_id} not found in results")
+        return None
+    
     def get_target_cve(self, cves: List[Dict], target_id: str = "CVE-2025-55182") -> Optional[Dict]:
         """Find a specific CVE by ID
         
@@ -98,8 +320,16 @@ class CVEScanner:
         Returns:
             Normalized CVE information
         """
-        return {
-            "cve_id": cve.get("cve_id") or cve.get("id", "Unknown"),
+        cve_id = cve.get("cve_id") or cve.get("id", "Unknown")
+        
+        # Reuse the normalized dict when the same record comes back on a later
+        # poll; each poll builds new dicts, so compare content, not identity
+        cached = self._info_cache.get(cve_id)
+        if cached is not None and (cached["raw_data"] is cve or cached["raw_data"] == cve):
+            return cached
+        
+        info = {
+            "cve_id": cve_id,
             "description": cve.get("description", "No description available"),
             "severity": self._extract_severity(cve),
             "published_date": cve.get("published_date") or cve.get("publishedDate"),
@@ -108,31 +338,30 @@ class CVEScanner:
             "affected_products": cve.get("affected_products", []),
             "raw_data": cve
         }
+        
+        if len(self._info_cache) >= self._info_cache_size and cve_id not in self._info_cache:
+            del self._info_cache[next(iter(self._info_cache))]
+        self._info_cache[cve_id] = info
+        
+        return info
     
     def _extract_severity(self, cve: Dict) -> str:
         """Extract severity from various possible fields"""
-        severity_fields = ["severity", "impact", "cvss_severity"]
-        for field in severity_fields:
-            if field in cve:
-                value = cve[field]
-                if isinstance(value, dict):
-                    return value.get("baseScore", "Unknown")
-                return str(value)
-        return "Unknown"
+        value = cve.get("severity", cve.get("impact", cve.get("cvss_severity", _MISSING)))
+        if value is _MISSING:
+            return "Unknown"
+        if isinstance(value, dict):
+            return value.get("baseScore", "Unknown")
+        return str(value)
     
     def _extract_cvss_score(self, cve: Dict) -> float:
         """Extract CVSS score from various possible fields"""
-        cvss_fields = ["cvss_score", "cvss", "impact"]
-        for field in cvss_fields:
-            if field in cve:
-                value = cve[field]
-                if isinstance(value, (int, float)):
-                    return float(value)
-                if isinstance(value, dict):
-                    score = value.get("baseScore") or value.get("cvss_score")
-                    if score:
-                        return float(score)
-        return 0.0
+        return float(
+            _score_from(cve.get("cvss_score"))
+            or _score_from(cve.get("cvss"))
+            or _score_from(cve.get("impact"))
+            or 0.0
+        )
 
 if __name__ == "__main__":
     # Test the scanner
@@ -145,4 +374,9 @@ if __name__ == "__main__":
             info = scanner.extract_cve_info(cve)
             print(f"- {info['cve_id']}: {info['description'][:100]}...")
     else:
-        print("No CVEs found")
\ No newline at end of file
+        print("No CVEs found")
+    
+    target = scanner.find_target_streaming(since_minutes=60)
+    if target:
+        info = scanner.extract_cve_info(target)
+        print(f"Target {info['cve_id']} ({info['severity']}, CVSS {info['cvss_score']}): {info['description'][:100]}...")
\ No newline at end of file
@@ -9,9 +9,11 @@ import os
 from simple_voice_interface import create_simple_voice_interface
 from command_engine import CommandEngine
 
+# Built once and shared by every demo command
+engine = CommandEngine()
+
 def demo_command_handler(command: str) -> str:
     """Demo command handler that shows what each command does"""
-    engine = CommandEngine()
     return engine.process_voice_command(command, "CVE-2025-55182")
 
 def main():
@@ -9,12 +9,13 @@ import subprocess
 import sys
 import platform
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-def run_command(cmd, description):
-    """Run a shell command with error handling"""
+def run_command(argv, description):
+    """Run a command (argv list, no shell) with error handling"""
     print(f"Installing {description}...")
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        result = subprocess.run(argv, capture_output=True, text=True, check=False)
         if result.returncode == 0:
             print(f"✅ {description} installed successfully")
             return True
@@ -30,13 +31,19 @@ def install_pyaudio_macos():
     print("Installing PyAudio on macOS...")
     
     # Try homebrew first
-    if run_command("brew install portaudio", "PortAudio via Homebrew"):
-        if run_command("pip install PyAudio", "PyAudio"):
+    if run_command(["brew", "install", "portaudio"], "PortAudio via Homebrew"):
+        if run_command(["pip", "install", "PyAudio"], "PyAudio"):
             return True
     
     # Fallback to pip with system libraries
     print("Trying pip installation with system flags...")
-    return run_command("pip install --global-option='build_ext' --global-option='-I/usr/local/include' --global-option='-L/usr/local/lib' PyAudio", "PyAudio with system libs")
+    return run_command([
+        "pip", "install",
+        "--global-option=build_ext",
+        "--global-option=-I/usr/local/include",
+        "--global-option=-L/usr/local/lib",
+        "PyAudio"
+    ], "PyAudio with system libs")
 
 def install_dependencies():
     """Install all dependencies with platform-specific handling"""
@@ -59,9 +66,17 @@ def install_dependencies():
     print("Installing core dependencies...")
     failed = []
     
-    for package, name in core_deps:
-        if not run_command(f"pip install '{package}'", name):
-            failed.append(name)
+    # A single pip run resolves and downloads everything in one pass
+    packages = [package for package, _ in core_deps]
+    if not run_command(["pip", "install", *packages], "core dependencies"):
+        # Retry per package so the summary can report which ones failed
+        print("Retrying core dependencies individually...")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = executor.map(
+                lambda dep: run_command(["pip", "install", dep[0]], dep[1]),
+                core_deps
+            )
+            failed = [name for (_, name), ok in zip(core_deps, results) if not ok]
     
     # Handle PyAudio separately due to platform issues
     pyaudio_success = False
@@ -71,10 +86,11 @@ def install_dependencies():
     elif system == "Linux":
         # Try installing system dependencies first
         print("Installing Linux audio dependencies...")
-        run_command("sudo apt-get update && sudo apt-get install -y portaudio19-dev python3-pyaudio", "Linux audio libs")
-        pyaudio_success = run_command("pip install PyAudio", "PyAudio")
+        if run_command(["sudo", "apt-get", "update"], "Linux package index"):
+            run_command(["sudo", "apt-get", "install", "-y", "portaudio19-dev", "python3-pyaudio"], "Linux audio libs")
+        pyaudio_success = run_command(["pip", "install", "PyAudio"], "PyAudio")
     elif system == "Windows":
-        pyaudio_success = run_command("pip install PyAudio", "PyAudio")
+        pyaudio_success = run_command(["pip", "install", "PyAudio"], "PyAudio")
     
     if not pyaudio_success:
         failed.append("PyAudio")
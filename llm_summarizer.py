@@ -1,21 +1,422 @@
 #!/usr/bin/env python3
 
 import os
-from typing import Dict, Optional
-from openai import OpenAI
+import re
+import json
+import time
+import random
+import hashlib
+import asyncio
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, Iterator, List, Optional
+import httpx
+from openai import OpenAI, AsyncOpenAI, RateLimitError
 from loguru import logger
+from semantic_cache import SemanticCache
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+# The system prompt is the static prefix of every request. Keep it
+# byte-for-byte stable and longer than 1024 tokens so OpenAI's prompt
+# caching can discount it; per-CVE data goes in the user message only.
+SUMMARY_FOCUS = """Focus on:
+1. What the vulnerability is (in simple terms)
+2. How attackers exploit it
+3. Why it's dangerous to our systems
+4. Evidence of active exploitation (if any)
+5. Immediate remediation actions needed"""
+
+SYSTEM_PROMPT = f"""You are a cybersecurity expert explaining vulnerabilities to on-call engineers. Be concise, clear, and actionable. Focus on immediate threats and remediation steps.
+
+Each request describes one or more vulnerabilities (CVE ID, description, severity, CVSS score and, when known, affected products). The engineer is receiving an urgent phone call and will hear your answer through text-to-speech.
+
+{SUMMARY_FOCUS}
+
+Delivery rules:
+- Keep each summary under 300 words and suitable for text-to-speech delivery. Be urgent but clear.
+- Write in plain spoken sentences. Do not use markdown, bullet symbols, tables, code blocks or URLs.
+- Spell out abbreviations the first time they are spoken if they are not widely known, for example "cross-site scripting" rather than only "XSS".
+- Say CVSS scores as numbers ("nine point eight"), and name the severity band.
+- Lead with the single most important action, then the supporting detail.
+- Do not speculate about exploitation. Only state that exploitation is active when the description says so; otherwise say that no exploitation has been reported in the provided data.
+- If the description is vague or missing, say so briefly and recommend checking the vendor advisory.
+- If the user message asks for a specific output format, such as a JSON object, follow it exactly.
+
+Severity bands (CVSS v3):
+- 9.0 to 10.0 Critical: treat as an incident. Patch or isolate within hours.
+- 7.0 to 8.9 High: remediate within days; sooner if internet-facing.
+- 4.0 to 6.9 Medium: schedule remediation in the normal patch cycle.
+- 0.1 to 3.9 Low: track and fix opportunistically.
+
+Vulnerability class reference (CWE) with the typical first response:
+- CWE-78 OS command injection and CWE-94 code injection: attacker-controlled input reaches a shell or interpreter. Patch immediately; until then block the affected endpoint or disable the feature.
+- CWE-502 deserialization of untrusted data: crafted objects trigger code execution on load. Patch, and reject untrusted serialized input at the edge.
+- CWE-787 out-of-bounds write and CWE-416 use after free: memory corruption that often leads to remote code execution. Patch; restart affected services so the fixed binary is loaded.
+- CWE-89 SQL injection: database queries built from user input. Patch, enable web application firewall rules, and review database logs for unusual queries.
+- CWE-79 cross-site scripting: script injected into pages viewed by other users. Patch; consider a stricter content security policy.
+- CWE-22 path traversal: file paths escape the intended directory. Patch; check web logs for "../" patterns.
+- CWE-287 improper authentication and CWE-306 missing authentication for a critical function: attackers reach privileged actions without valid credentials. Patch, restrict network access to the service, and rotate credentials that may have been exposed.
+- CWE-918 server-side request forgery: the server is tricked into requesting internal resources such as cloud metadata endpoints. Patch and block outbound access to metadata services.
+- CWE-352 cross-site request forgery: a logged-in user's browser is made to perform actions. Patch; confirm anti-forgery tokens are enforced.
+- CWE-400 uncontrolled resource consumption: denial of service. Patch; apply rate limits and monitor resource usage.
+- CWE-200 exposure of sensitive information: data leaks to unauthorized parties. Patch, then assess what data was exposed and whether secrets need rotation.
+- CWE-269 improper privilege management and CWE-862 missing authorization: a low-privileged user performs administrative actions. Patch, review role assignments, and audit recent administrative activity.
+- CWE-798 hard-coded credentials: a fixed password or key ships with the product. Patch, change the credential wherever possible, and block management interfaces from untrusted networks.
+- CWE-434 unrestricted file upload: an attacker uploads a script that the server later executes. Patch, disable execution in upload directories, and search them for unexpected files.
+- CWE-611 XML external entity processing: crafted XML reads local files or reaches internal hosts. Patch and disable external entity resolution in XML parsers.
+- CWE-119 and CWE-120 buffer overflows: classic memory corruption in native code, often reachable over the network. Patch; where exploitation is reported, isolate the host until it is updated.
+
+General remediation playbook:
+1. Confirm whether the affected product and version are deployed.
+2. Apply the vendor patch or upgrade. If no patch exists, apply the vendor's documented mitigation.
+3. If the system is internet-facing and cannot be patched quickly, quarantine it or restrict access.
+4. Look for indicators of compromise: unexpected processes, new accounts, outbound connections, and modified files.
+5. Rotate credentials and keys stored on or used by an affected system if compromise is suspected.
+6. Record the incident and decisions for the post-incident review.
+
+The engineer can reply by voice with these commands: "start patching", "quarantine servers", "acknowledge incident", "status report" and "emergency shutdown". Recommend the command that best fits the situation when it is clear."""
+
+# Spoken when the LLM call fails
+_FALLBACK_TEMPLATE = """
+SECURITY ALERT: {cve_id}
+
+Vulnerability Description: {desc}
+
+Severity Level: {severity}
+
+This is an automated alert. A new vulnerability has been detected that may affect your systems. 
+
+Immediate Actions Required:
+1. Review the vulnerability details
+2. Check if your systems are affected  
+3. Apply patches if available
+4. Consider isolating affected systems
+
+Please respond with voice commands to take action or escalate to your security team.
+"""
+
+# Phone script wrapped around a summary
+_VOICE_SCRIPT_TEMPLATE = """
+Security Alert! This is an urgent notification about vulnerability {cve_id}.
+
+{summary}
+
+You can respond with the following voice commands:
+- Say "start patching" to begin automatic patching
+- Say "quarantine servers" to isolate affected systems  
+- Say "acknowledge incident" to log acknowledgment
+
+What would you like to do?
+""".strip()
+
+# Whitespace following a sentence terminator
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+class SentenceBuffer:
+    """Accumulate streamed LLM tokens and release only complete sentences
+    
+    Each released sentence is a self-contained TTS request, so prosody is
+    not broken mid-word. A terminator after a known abbreviation ("Dr.",
+    "e.g.") does not end a sentence, and pieces shorter than min_length
+    are merged into the next sentence.
+    """
+    
+    ABBREVIATIONS = frozenset({
+        "dr.", "mr.", "mrs.", "ms.", "vs.", "etc.", "e.g.", "i.e.", "no.", "a.m.", "p.m."
+    })
+    
+    def __init__(self, min_length: int = 10):
+        self.min_length = min_length
+        self._buffer = ""
+    
+    def feed(self, token: str) -> List[str]:
+        """Add a token and return the sentences it completed (often none)"""
+        self._buffer += token
+        sentences = []
+        start = 0
+        
+        for match in SENTENCE_BOUNDARY.finditer(self._buffer):
+            sentence = self._buffer[start:match.start()].strip()
+            if len(sentence) < self.min_length:
+                continue
+            if sentence.rsplit(None, 1)[-1].lower() in self.ABBREVIATIONS:
+                continue
+            sentences.append(sentence)
+            start = match.end()
+        
+        self._buffer = self._buffer[start:]
+        return sentences
+    
+    def flush(self) -> Optional[str]:
+        """Return whatever is left at the end of the stream"""
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest or None
+
+def split_sentences(text: str) -> List[str]:
+    """Split complete text the same way SentenceBuffer splits a stream"""
+    buffer = SentenceBuffer()
+    sentences = buffer.feed(text)
+    rest = buffer.flush()
+    return sentences + [rest] if rest else sentences
+
+# Event loop -> shared async HTTP client. Pooled connections belong to the
+# loop that opened them, so each loop (e.g. each asyncio.run) gets its own
+_HTTP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Async HTTP client shared by every LLMSummarizer on the running loop
+    
+    The default per-client pool (10 connections) collapses throughput under
+    concurrent summarization, so all instances share one larger pool.
+    """
+    loop = asyncio.get_running_loop()
+    client = _HTTP_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        options = {
+            "limits": httpx.Limits(max_connections=200, max_keepalive_connections=200, keepalive_expiry=30),
+            "timeout": httpx.Timeout(60.0, connect=5.0),
+        }
+        try:
+            client = httpx.AsyncClient(http2=True, **options)
+        except ImportError:
+            # HTTP/2 needs the optional h2 package
+            client = httpx.AsyncClient(**options)
+        _HTTP_CLIENTS[loop] = client
+    return client
+
+class RateLimiter:
+    """Bounded concurrency plus request/token buckets for OpenAI calls
+    
+    Keeps throughput at the account's rate limits instead of bursting
+    past them and stalling on 429 retries.
+    """
+    
+    def __init__(self, max_requests_per_minute: int = 3500, max_tokens_per_minute: int = 90000, max_concurrent: int = 20):
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.available_request_capacity = float(max_requests_per_minute)
+        self.available_token_capacity = float(max_tokens_per_minute)
+        self.max_concurrent = max_concurrent
+        # Semaphores bind to the loop they first wait on, so each event loop
+        # gets its own; the buckets are shared across loops
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._last_update = time.monotonic()
+    
+    def _refill(self):
+        """Refill both buckets for the time elapsed since the last check"""
+        now = time.monotonic()
+        elapsed = now - self._last_update
+        self._last_update = now
+        
+        self.available_request_capacity = min(
+            self.max_requests_per_minute,
+            self.available_request_capacity + self.max_requests_per_minute * elapsed / 60
+        )
+        self.available_token_capacity = min(
+            self.max_tokens_per_minute,
+            self.available_token_capacity + self.max_tokens_per_minute * elapsed / 60
+        )
+    
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int):
+        """Wait for a concurrency slot and enough request/token capacity
+        
+        Args:
+            estimated_tokens: Expected prompt plus completion tokens
+        """
+        estimated_tokens = min(estimated_tokens, self.max_tokens_per_minute)
+        
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrent)
+        
+        async with semaphore:
+            while True:
+                self._refill()
+                if self.available_request_capacity >= 1 and self.available_token_capacity >= estimated_tokens:
+                    self.available_request_capacity -= 1
+                    self.available_token_capacity -= estimated_tokens
+                    break
+                await asyncio.sleep(0.05)
+            
+            yield
 
 class LLMSummarizer:
     """Handles LLM-based vulnerability summarization"""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4",
+                 max_requests_per_minute: int = 3500, max_tokens_per_minute: int = 90000,
+                 max_concurrent: int = 20, max_attempts: int = 5):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.model = model
+        self.max_attempts = max_attempts
+        self.limiter = RateLimiter(max_requests_per_minute, max_tokens_per_minute, max_concurrent)
         
         if not self.api_key:
             raise ValueError("OpenAI API key not provided")
             
         self.client = OpenAI(api_key=self.api_key)
+        
+        # Summary cache: in-process LRU first, then Redis (if REDIS_URL is set)
+        # so rescans and other processes reuse earlier summaries
+        self._mem = OrderedDict()
+        self._mem_size = 1024
+        self.cache_ttl = 86400
+        self.redis = None
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url and REDIS_AVAILABLE:
+            try:
+                self.redis = redis.Redis.from_url(redis_url)
+            except Exception as e:
+                logger.warning(f"Redis cache unavailable: {e}")
+        
+        # Optional semantic cache for near-duplicate descriptions
+        self.semantic_cache = None
+        if os.getenv("SEMANTIC_CACHE", "false").lower() == "true":
+            try:
+                self.semantic_cache = SemanticCache(
+                    path=os.getenv("SEMANTIC_CACHE_PATH", "cache/semantic_summaries"),
+                    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.95))
+                )
+            except ImportError as e:
+                logger.warning(f"Semantic cache disabled, missing dependency: {e}")
+        
+        # Async clients for concurrent batch summarization, one per event loop
+        # on that loop's shared pool (see the aclient property)
+        self._aclients = weakref.WeakKeyDictionary()  # loop -> (http client, AsyncOpenAI)
+    
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        """Async OpenAI client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        http_client = _get_http_client()
+        cached = self._aclients.get(loop)
+        if cached is None or cached[0] is not http_client:
+            cached = (http_client, AsyncOpenAI(api_key=self.api_key, http_client=http_client))
+            self._aclients[loop] = cached
+        return cached[1]
+    
+    async def aclose(self):
+        """Close the running loop's shared HTTP pool
+        
+        Call before the loop that made async summaries finishes.
+        """
+        loop = asyncio.get_running_loop()
+        self._aclients.pop(loop, None)
+        client = _HTTP_CLIENTS.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+    
+    def _completion_kwargs(self, prompt: str) -> Dict:
+        """Build the chat completion request shared by the sync and async paths"""
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": SYSTEM_PROMPT
+                },
+                {
+                    "role": "user", 
+                    "content": prompt
+                }
+            ],
+            "max_tokens": 500,
+            "temperature": 0.3
+        }
+    
+    def _cache_key(self, cve_info: Dict, prompt: str) -> str:
+        """Cache key covering the model, system prompt and user prompt
+        
+        Hashing the rendered prompts means prompt template changes
+        invalidate old entries automatically.
+        """
+        digest = hashlib.blake2b(f"{self.model}|{SYSTEM_PROMPT}|{prompt}".encode(), digest_size=16).hexdigest()
+        return f"llm_summary:{cve_info.get('cve_id', 'Unknown')}:{digest}"
+    
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Look up a cached summary in memory, then Redis"""
+        if key in self._mem:
+            self._mem.move_to_end(key)
+            return self._mem[key]
+        
+        if self.redis is not None:
+            try:
+                cached = self.redis.get(key)
+            except Exception as e:
+                logger.warning(f"Redis cache read failed: {e}")
+                return None
+            if cached is not None:
+                summary = cached.decode()
+                self._remember(key, summary)
+                return summary
+        
+        return None
+    
+    def _cache_set(self, key: str, summary: str):
+        """Store a summary in memory and Redis"""
+        self._remember(key, summary)
+        
+        if self.redis is not None:
+            try:
+                self.redis.setex(key, self.cache_ttl, summary)
+            except Exception as e:
+                logger.warning(f"Redis cache write failed: {e}")
+    
+    def _remember(self, key: str, summary: str):
+        """Insert into the in-process LRU, evicting the oldest entry when full"""
+        self._mem[key] = summary
+        self._mem.move_to_end(key)
+        if len(self._mem) > self._mem_size:
+            self._mem.popitem(last=False)
+    
+    def _semantic_lookup(self, cve_info: Dict) -> Optional[str]:
+        """Check the semantic cache, treating any failure as a miss"""
+        description = cve_info.get("description")
+        if self.semantic_cache is None or not description:
+            return None
+        try:
+            return self.semantic_cache.lookup(description)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+    
+    def _semantic_add(self, cve_info: Dict, summary: str):
+        """Add a fresh summary to the semantic cache"""
+        description = cve_info.get("description")
+        if self.semantic_cache is None or not description:
+            return
+        try:
+            self.semantic_cache.add(description, cve_info.get("cve_id", "Unknown"), summary)
+        except Exception as e:
+            logger.warning(f"Semantic cache update failed: {e}")
+    
+    def cache_bust(self, cve_id: str):
+        """Drop cached summaries for a CVE so the next call regenerates it
+        
+        Args:
+            cve_id: CVE identifier
+        """
+        prefix = f"llm_summary:{cve_id}:"
+        for key in [key for key in self._mem if key.startswith(prefix)]:
+            del self._mem[key]
+        
+        if self.redis is not None:
+            try:
+                for key in self.redis.scan_iter(match=f"{prefix}*"):
+                    self.redis.delete(key)
+            except Exception as e:
+                logger.warning(f"Redis cache bust failed: {e}")
+        
+        logger.info(f"Cleared cached summaries for {cve_id}")
     
     def generate_summary(self, cve_info: Dict) -> str:
         """Generate a vulnerability summary for voice delivery
@@ -28,37 +429,309 @@ class LLMSummarizer:
         """
         try:
             prompt = self._create_summary_prompt(cve_info)
+            key = self._cache_key(cve_info, prompt)
+            
+            cached = self._cache_get(key)
+            if cached is not None:
+                logger.info(f"Using cached summary for {cve_info.get('cve_id', 'unknown CVE')}")
+                return cached
+            
+            similar = self._semantic_lookup(cve_info)
+            if similar is not None:
+                self._cache_set(key, similar)
+                return similar
             
             logger.info(f"Generating LLM summary for {cve_info.get('cve_id', 'unknown CVE')}")
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a cybersecurity expert explaining vulnerabilities to on-call engineers. Be concise, clear, and actionable. Focus on immediate threats and remediation steps."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                max_tokens=500,
-                temperature=0.3
-            )
+            response = self.client.chat.completions.create(**self._completion_kwargs(prompt))
             
             summary = response.choices[0].message.content.strip()
             logger.info(f"Generated summary of {len(summary)} characters")
+            self._log_prompt_cache_usage(response)
             
+            self._cache_set(key, summary)
+            self._semantic_add(cve_info, summary)
             return summary
             
         except Exception as e:
             logger.error(f"Failed to generate LLM summary: {e}")
             return self._generate_fallback_summary(cve_info)
     
-    def _create_summary_prompt(self, cve_info: Dict) -> str:
-        """Create the LLM prompt for vulnerability summarization"""
+    def generate_summary_stream(self, cve_info: Dict) -> Iterator[str]:
+        """Stream a vulnerability summary sentence by sentence
+        
+        Lets voice delivery start on the first sentence instead of waiting
+        for the whole summary. The complete summary is cached as usual.
+        
+        Args:
+            cve_info: Normalized CVE information dictionary
+            
+        Yields:
+            Complete sentences of the summary
+        """
+        prompt = self._create_summary_prompt(cve_info)
+        key = self._cache_key(cve_info, prompt)
+        
+        cached = self._cache_get(key)
+        if cached is not None:
+            logger.info(f"Using cached summary for {cve_info.get('cve_id', 'unknown CVE')}")
+            yield from split_sentences(cached)
+            return
+        
+        similar = self._semantic_lookup(cve_info)
+        if similar is not None:
+            self._cache_set(key, similar)
+            yield from split_sentences(similar)
+            return
+        
+        parts = []
+        buffer = SentenceBuffer()
+        
+        try:
+            logger.info(f"Streaming LLM summary for {cve_info.get('cve_id', 'unknown CVE')}")
+            
+            stream = self.client.chat.completions.create(**self._completion_kwargs(prompt), stream=True)
+            
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                
+                parts.append(delta)
+                yield from buffer.feed(delta)
+            
+            complete = True
+        except Exception as e:
+            logger.error(f"Failed to stream LLM summary: {e}")
+            if not parts:
+                yield self._generate_fallback_summary(cve_info)
+                return
+            complete = False
+        
+        rest = buffer.flush()
+        if rest:
+            yield rest
+        
+        summary = "".join(parts).strip()
+        logger.info(f"Streamed summary of {len(summary)} characters")
+        
+        # A stream cut off partway is spoken once but never cached
+        if complete:
+            self._cache_set(key, summary)
+            self._semantic_add(cve_info, summary)
+    
+    def _log_prompt_cache_usage(self, response):
+        """Log how many prompt tokens OpenAI served from its prompt cache"""
+        details = getattr(getattr(response, "usage", None), "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None)
+        if cached_tokens is not None:
+            logger.debug(f"Prompt cache: {cached_tokens}/{response.usage.prompt_tokens} tokens cached")
+    
+    async def agenerate_summary(self, cve_info: Dict) -> str:
+        """Async variant of generate_summary
+        
+        Args:
+            cve_info: Normalized CVE information dictionary
+            
+        Returns:
+            Human-readable vulnerability summary
+        """
+        try:
+            prompt = self._create_summary_prompt(cve_info)
+            key = self._cache_key(cve_info, prompt)
+            
+            cached = self._cache_get(key)
+            if cached is not None:
+                logger.info(f"Using cached summary for {cve_info.get('cve_id', 'unknown CVE')}")
+                return cached
+            
+            similar = self._semantic_lookup(cve_info)
+            if similar is not None:
+                self._cache_set(key, similar)
+                return similar
+            
+            # Request-side I/O runs alongside the LLM call instead of ahead of it
+            _, summary = await asyncio.gather(
+                self._alog_request(cve_info),
+                self._acall_llm(prompt)
+            )
+            
+            self._cache_set(key, summary)
+            self._semantic_add(cve_info, summary)
+            return summary
+            
+        except Exception as e:
+            logger.error(f"Failed to generate LLM summary: {e}")
+            return self._generate_fallback_summary(cve_info)
+    
+    async def _alog_request(self, cve_info: Dict):
+        """Record that a summary was requested
+        
+        Audit writes or metrics for the request belong here so they overlap
+        with the LLM round-trip.
+        """
+        logger.info(f"Generating LLM summary for {cve_info.get('cve_id', 'unknown CVE')}")
+    
+    async def _acall_llm(self, prompt: str) -> str:
+        """Call the LLM and return the stripped summary text"""
+        response = await self._acreate_with_retry(prompt)
+        
+        summary = response.choices[0].message.content.strip()
+        logger.info(f"Generated summary of {len(summary)} characters")
+        self._log_prompt_cache_usage(response)
+        
+        return summary
+    
+    async def _acreate_with_retry(self, prompt: str):
+        """Rate-limited completion call with exponential backoff on 429s"""
+        estimated_tokens = len(prompt) // 4 + 500
+        
+        for attempt in range(self.max_attempts):
+            try:
+                async with self.limiter.acquire(estimated_tokens):
+                    return await self.aclient.chat.completions.create(**self._completion_kwargs(prompt))
+            except RateLimitError:
+                if attempt == self.max_attempts - 1:
+                    raise
+                delay = 2 ** attempt + random.random()
+                logger.warning(f"OpenAI rate limit hit, retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_attempts})")
+                await asyncio.sleep(delay)
+    
+    async def generate_summaries(self, cves: List[Dict]) -> List[str]:
+        """Summarize several CVEs concurrently
+        
+        Args:
+            cves: Normalized CVE information dictionaries
+            
+        Returns:
+            Summaries in the same order as the input
+        """
+        return await asyncio.gather(*(self.agenerate_summary(cve_info) for cve_info in cves))
+    
+    def generate_summaries_packed(self, cves: List[Dict], pack_size: int = 10) -> Dict[str, str]:
+        """Summarize CVEs several per request to amortize the prompt overhead
+        
+        The system prompt and instructions are sent once per pack instead of
+        once per CVE. Any CVE missing from a pack's response is summarized
+        individually with generate_summary.
+        
+        Args:
+            cves: Normalized CVE information dictionaries
+            pack_size: Maximum CVEs per request
+            
+        Returns:
+            Mapping of CVE ID to summary
+        """
+        summaries = {}
+        
+        for start in range(0, len(cves), pack_size):
+            pack = cves[start:start + pack_size]
+            
+            try:
+                logger.info(f"Generating packed LLM summary for {len(pack)} CVEs")
+                
+                request = self._completion_kwargs(self._create_packed_prompt(pack))
+                request["max_tokens"] = 500 * len(pack)
+                request["response_format"] = {"type": "json_object"}
+                
+                response = self.client.chat.completions.create(**request)
+                packed = json.loads(response.choices[0].message.content)
+                
+                for cve_id, summary in packed.items():
+                    if isinstance(summary, str):
+                        summaries[cve_id] = summary.strip()
+                        
+            except Exception as e:
+                logger.error(f"Failed to generate packed LLM summary: {e}")
+            
+            for cve_info in pack:
+                cve_id = cve_info.get("cve_id", "Unknown")
+                if cve_id not in summaries:
+                    summaries[cve_id] = self.generate_summary(cve_info)
+        
+        return summaries
+    
+    def submit_batch(self, cves: List[Dict]) -> str:
+        """Submit CVEs to the OpenAI Batch API for non-interactive summarization
+        
+        Batch requests cost half as much and use a separate rate-limit pool,
+        but complete within 24 hours rather than seconds. Use for bulk sweeps,
+        not for live alerts.
+        
+        Args:
+            cves: Normalized CVE information dictionaries
+            
+        Returns:
+            Batch ID to pass to wait_for_batch
+        """
+        lines = []
+        seen = set()
+        for cve_info in cves:
+            cve_id = cve_info.get("cve_id", "Unknown")
+            if cve_id in seen:
+                continue
+            seen.add(cve_id)
+            lines.append(json.dumps({
+                "custom_id": cve_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._completion_kwargs(self._create_summary_prompt(cve_info))
+            }))
+        
+        batch_file = self.client.files.create(
+            file=("cve_summaries.jsonl", "\n".join(lines).encode()),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        
+        logger.info(f"Submitted batch {batch.id} with {len(lines)} CVEs")
+        return batch.id
+    
+    def wait_for_batch(self, batch_id: str, poll: int = 30) -> Dict[str, str]:
+        """Wait for a submitted batch and collect its summaries
+        
+        Args:
+            batch_id: ID returned by submit_batch
+            poll: Seconds between status checks
+            
+        Returns:
+            Mapping of CVE ID to summary; CVEs whose request failed are omitted
+        """
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in ("completed", "failed", "expired", "cancelled"):
+                break
+            logger.info(f"Batch {batch_id} status: {batch.status}")
+            time.sleep(poll)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(f"Batch {batch_id} finished with status {batch.status}")
+            return {}
+        
+        summaries = {}
+        output = self.client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            body = (result.get("response") or {}).get("body") or {}
+            choices = body.get("choices")
+            if result.get("error") or not choices:
+                logger.warning(f"Batch request for {result.get('custom_id')} failed")
+                continue
+            summaries[result["custom_id"]] = choices[0]["message"]["content"].strip()
         
+        logger.info(f"Batch {batch_id} returned {len(summaries)} summaries")
+        return summaries
+    
+    def _format_cve_fields(self, cve_info: Dict) -> str:
+        """Format the CVE fields block shared by the single and packed prompts"""
         cve_id = cve_info.get('cve_id', 'Unknown')
         description = cve_info.get('description', 'No description available')
         severity = cve_info.get('severity', 'Unknown')
@@ -69,49 +742,40 @@ class LLMSummarizer:
         if affected_products:
             affected_text = f"\nAffected products: {', '.join(affected_products[:5])}"
         
-        prompt = f"""
-Summarize the following vulnerability for an on-call engineer receiving an urgent phone call:
-
-CVE ID: {cve_id}
+        return f"""CVE ID: {cve_id}
 Description: {description}
 Severity: {severity}
-CVSS Score: {cvss_score}{affected_text}
-
-Focus on:
-1. What the vulnerability is (in simple terms)
-2. How attackers exploit it
-3. Why it's dangerous to our systems
-4. Evidence of active exploitation (if any)
-5. Immediate remediation actions needed
+CVSS Score: {cvss_score}{affected_text}"""
+    
+    def _create_summary_prompt(self, cve_info: Dict) -> str:
+        """Create the LLM prompt for vulnerability summarization
+        
+        Instructions live in SYSTEM_PROMPT; only the CVE data varies here.
+        """
+        return self._format_cve_fields(cve_info)
+    
+    def _create_packed_prompt(self, cves: List[Dict]) -> str:
+        """Create one LLM prompt covering several CVEs"""
+        
+        entries = "\n\n".join(
+            f"{i}. {self._format_cve_fields(cve_info)}" for i, cve_info in enumerate(cves, 1)
+        )
+        
+        prompt = f"""Summarize each of the following vulnerabilities.
+Return a JSON object: {{"CVE-ID": "summary text", ...}} with one entry per CVE ID below.
 
-Keep the response under 300 words and suitable for text-to-speech delivery. Be urgent but clear.
-"""
+{entries}"""
         return prompt
     
     def _generate_fallback_summary(self, cve_info: Dict) -> str:
         """Generate a basic summary when LLM fails"""
         
         cve_id = cve_info.get('cve_id', 'Unknown CVE')
-        description = cve_info.get('description', 'No description available')[:200]
+        description = cve_info.get('description', 'No description available')
+        desc = description if len(description) <= 200 else description[:200]
         severity = cve_info.get('severity', 'Unknown')
         
-        return f"""
-SECURITY ALERT: {cve_id}
-
-Vulnerability Description: {description}
-
-Severity Level: {severity}
-
-This is an automated alert. A new vulnerability has been detected that may affect your systems. 
-
-Immediate Actions Required:
-1. Review the vulnerability details
-2. Check if your systems are affected  
-3. Apply patches if available
-4. Consider isolating affected systems
-
-Please respond with voice commands to take action or escalate to your security team.
-"""
+        return _FALLBACK_TEMPLATE.format_map({"cve_id": cve_id, "desc": desc, "severity": severity})
 
     def generate_voice_script(self, summary: str, cve_id: str) -> str:
         """Generate a voice script optimized for phone delivery
@@ -123,19 +787,7 @@ Please respond with voice commands to take action or escalate to your security t
         Returns:
             Voice-optimized script
         """
-        script = f"""
-Security Alert! This is an urgent notification about vulnerability {cve_id}.
-
-{summary}
-
-You can respond with the following voice commands:
-- Say "start patching" to begin automatic patching
-- Say "quarantine servers" to isolate affected systems  
-- Say "acknowledge incident" to log acknowledgment
-
-What would you like to do?
-"""
-        return script.strip()
+        return _VOICE_SCRIPT_TEMPLATE.format_map({"cve_id": cve_id, "summary": summary})
 
 if __name__ == "__main__":
     # Test the summarizer
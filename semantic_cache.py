@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+import os
+import json
+from typing import Dict, Optional
+from loguru import logger
+
+class SemanticCache:
+    """Map texts to cached values by embedding similarity
+    
+    Texts are embedded locally with MiniLM and compared by cosine
+    similarity against previously added ones. Embeddings and their
+    (key, value) entries are persisted as a .npy matrix plus a JSON
+    sidecar. New texts are queued and embedded in one batch on the next
+    lookup or save; with autosave off, call save() to persist.
+    """
+    
+    def __init__(self, path: str = "cache/semantic_summaries", threshold: float = 0.95,
+                 model_name: str = "all-MiniLM-L6-v2", autosave: bool = True):
+        import numpy as np
+        
+        self._np = np
+        self.path = path
+        self.threshold = threshold
+        self.model_name = model_name
+        self.autosave = autosave
+        self._model = None
+        self._queued = []  # (text, entry) not embedded yet
+        self._dirty = False
+        self.embeddings = np.zeros((0, 384), dtype=np.float32)
+        self.entries = []  # (key, value) parallel to embeddings
+        self._load()
+    
+    def _get_model(self):
+        """Load the embedding model on first use"""
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+    
+    def _encode(self, texts):
+        return self._get_model().encode(texts, normalize_embeddings=True).astype(self._np.float32)
+    
+    def _embed_queued(self):
+        """Embed every queued text in a single model call"""
+        if not self._queued:
+            return
+        texts, entries = zip(*self._queued)
+        self._queued = []
+        self.embeddings = self._np.vstack([self.embeddings, self._encode(list(texts))])
+        self.entries.extend(entries)
+    
+    def lookup(self, text: str) -> Optional[str]:
+        """Find the cached value whose text is similar enough
+        
+        Args:
+            text: Text to look up
+        
+        Returns:
+            Cached value or None
+        """
+        self._embed_queued()
+        if not self.entries:
+            return None
+        
+        sims = self.embeddings @ self._encode(text)
+        best = int(sims.argmax())
+        score = float(sims[best])
+        
+        if score > self.threshold:
+            logger.info(f"Semantic cache hit: {self.entries[best][0]} (similarity {score:.3f})")
+            return self.entries[best][1]
+        
+        if score > self.threshold - 0.05:
+            logger.debug(f"Semantic cache near miss: {self.entries[best][0]} (similarity {score:.3f})")
+        return None
+    
+    def add(self, text: str, key: str, value: str):
+        """Remember a value for a text, persisting it unless autosave is off"""
+        self._queued.append((text, (key, value)))
+        self._dirty = True
+        if self.autosave:
+            self.save()
+    
+    def save(self):
+        """Write the cache to disk if anything was added since the last save"""
+        if not self._dirty:
+            return
+        try:
+            self._embed_queued()
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._np.save(f"{self.path}.npy", self.embeddings)
+            with open(f"{self.path}.json", "w") as f:
+                json.dump(self.entries, f)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Failed to save semantic cache {self.path}: {e}")
+    
+    def _load(self):
+        try:
+            if os.path.exists(f"{self.path}.npy") and os.path.exists(f"{self.path}.json"):
+                embeddings = self._np.load(f"{self.path}.npy")
+                with open(f"{self.path}.json") as f:
+                    entries = [tuple(entry) for entry in json.load(f)]
+                if len(entries) == len(embeddings):
+                    self.embeddings = embeddings.astype(self._np.float32)
+                    self.entries = entries
+        except Exception as e:
+            logger.warning(f"Failed to load semantic cache {self.path}: {e}")
+
+class SemanticCommandCache(SemanticCache):
+    """Resolve paraphrased commands ("begin patching") to whitelisted triggers
+    
+    Utterances are compared against the triggers, the fuzzy keywords and
+    every utterance the command engine has learned from an exact or
+    confirmed match. Only the trigger is cached, never a command's output,
+    so a hit still runs the command. Learned utterances are saved in bulk
+    via save(), not on every command.
+    """
+    
+    def __init__(self, path: str = "cache/command_intents", threshold: float = 0.92,
+                 model_name: str = "all-MiniLM-L6-v2"):
+        super().__init__(path, threshold, model_name, autosave=False)
+        self._anchor_phrases = {}
+        self._anchors = None  # (embeddings, triggers) for the current whitelist
+        self._known = {text for text, _ in self.entries}
+    
+    def set_anchors(self, phrases: Dict[str, str]):
+        """Replace the phrase -> trigger anchors; embedded lazily on next lookup"""
+        self._anchor_phrases = dict(phrases)
+        self._anchors = None
+    
+    def lookup(self, command_text: str) -> Optional[str]:
+        """Find the trigger of the most similar known phrase
+        
+        Args:
+            command_text: Normalized command text
+        
+        Returns:
+            Trigger or None if nothing is similar enough
+        """
+        self._embed_queued()
+        if self._anchors is None:
+            self._anchors = (self._encode(list(self._anchor_phrases)), list(self._anchor_phrases.values()))
+        
+        anchor_vecs, anchor_triggers = self._anchors
+        vecs = self._np.vstack([anchor_vecs, self.embeddings])
+        triggers = anchor_triggers + [trigger for _, trigger in self.entries]
+        
+        sims = vecs @ self._encode(command_text)
+        best = int(sims.argmax())
+        score = float(sims[best])
+        
+        if score >= self.threshold and triggers[best] in self._anchor_phrases.values():
+            logger.info(f"Semantic match found: '{command_text}' -> '{triggers[best]}' (similarity {score:.3f})")
+            return triggers[best]
+        return None
+    
+    def add(self, command_text: str, trigger: str):
+        """Learn how an utterance was resolved; a no-op for known utterances"""
+        if command_text in self._anchor_phrases or command_text in self._known:
+            return
+        self._known.add(command_text)
+        super().add(command_text, command_text, trigger)
@@ -6,33 +6,193 @@ Uses system text-to-speech and text input for testing
 """
 
 import os
+import re
+import base64
 import subprocess
 import platform
-from typing import Optional, Callable
+from typing import Optional, Callable, Iterable, List
 from loguru import logger
 
+try:
+    from speech_recognition_helper import SpeechRecognizer
+    SPEECH_RECOGNIZER_AVAILABLE = True
+except ImportError:
+    SpeechRecognizer = None
+    SPEECH_RECOGNIZER_AVAILABLE = False
+
+# TTS daemons speak each line read from stdin until stdin is closed and
+# write an empty line to stdout once a line has been spoken. Text never
+# becomes part of a script, so quotes and $ in it are not interpreted.
+LINUX_TTS_COMMAND = [
+    "sh", "-c", 'while IFS= read -r line; do printf "%s\\n" "$line" | espeak; echo; done'
+]
+
+WINDOWS_TTS_SCRIPT = (
+    "Add-Type -AssemblyName System.speech; "
+    "$s = New-Object System.Speech.Synthesis.SpeechSynthesizer; "
+    "while (($line = [Console]::In.ReadLine()) -ne $null) { $s.Speak($line); [Console]::Out.WriteLine() }"
+)
+
+# -EncodedCommand keeps stdin free for text; -NoProfile skips profile loading
+WINDOWS_TTS_COMMAND = [
+    "powershell", "-NoProfile", "-NonInteractive", "-EncodedCommand",
+    base64.b64encode(WINDOWS_TTS_SCRIPT.encode("utf-16-le")).decode("ascii"),
+]
+
+# A command result containing any of these ends the conversation
+COMPLETION_RE = re.compile(r"completed|acknowledged|successful", re.IGNORECASE)
+
 class SimpleVoiceInterface:
     """Simple voice interface using system TTS and text input"""
     
     def __init__(self):
         self.system = platform.system()
+        
+        # Resolve the platform once instead of on every utterance.
+        # The daemon reads one utterance per stdin line; macOS `say` only
+        # speaks stdin once it is closed, so it has none.
+        self._tts_command = {
+            "Linux": LINUX_TTS_COMMAND,
+            "Windows": WINDOWS_TTS_COMMAND,
+        }.get(self.system)
+        self._speak_impl = {
+            "Darwin": self._speak_mac,
+            "Linux": self._speak_linux,
+            "Windows": self._speak_windows,
+        }.get(self.system, self._speak_stub)
+        
+        self._tts = self._start_tts()
+        self._tts_pending = 0  # lines handed to the daemon, not yet spoken
+        self._current_tts = None
+        
+        # Built once; detecting recognition methods spawns subprocesses
+        self._recognizer = None
+        if SPEECH_RECOGNIZER_AVAILABLE:
+            try:
+                self._recognizer = SpeechRecognizer()
+            except Exception as e:
+                logger.warning(f"Speech recognition failed: {e}, using text input")
+        else:
+            logger.warning("Speech recognition not available, using text input")
+        
         logger.info(f"Simple voice interface initialized for {self.system}")
     
-    def speak(self, text: str) -> bool:
-        """Use system text-to-speech to speak text"""
+    def _start_tts(self) -> Optional[subprocess.Popen]:
+        """Start a long-lived TTS process that speaks lines written to its stdin
+        
+        Returns:
+            The running process, or None when the platform has no line-based
+            TTS or it cannot be started
+        """
+        if self._tts_command is None:
+            return None
+        
         try:
-            if self.system == "Darwin":  # macOS
-                subprocess.run(["say", text], check=True)
-            elif self.system == "Linux":
-                subprocess.run(["espeak", text], check=True)
-            elif self.system == "Windows":
-                # Use PowerShell for Windows TTS
-                ps_command = f'Add-Type -AssemblyName System.speech; (New-Object System.Speech.Synthesis.SpeechSynthesizer).Speak("{text}")'
-                subprocess.run(["powershell", "-Command", ps_command], check=True)
-            else:
-                print(f"🔊 SYSTEM SPEAKING: {text}")
-                
-            return True
+            return subprocess.Popen(self._tts_command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        except OSError as e:
+            logger.warning(f"TTS daemon unavailable, speaking per utterance: {e}")
+            return None
+    
+    def _speak_daemon(self, text: str, blocking: bool) -> bool:
+        """Hand text to the TTS daemon
+        
+        Args:
+            text: Text to speak
+            blocking: Wait until the daemon reports the line spoken;
+                otherwise wait_for_tts() does
+            
+        Returns:
+            True if the daemon took the text, False to speak it per utterance
+        """
+        if self._tts is None or self._tts.poll() is not None:
+            # Not started yet, stopped, or died; start a fresh one
+            self._tts = self._start_tts()
+            self._tts_pending = 0
+        
+        if self._tts is None:
+            return False
+        
+        try:
+            # One line per utterance; embedded newlines would split it
+            self._tts.stdin.write(" ".join(text.split()) + "\n")
+            self._tts.stdin.flush()
+        except (OSError, ValueError) as e:
+            logger.warning(f"TTS daemon failed, speaking per utterance: {e}")
+            self._tts = None
+            self._tts_pending = 0
+            return False
+        
+        self._tts_pending += 1
+        if blocking:
+            self._wait_for_daemon()
+        return True
+    
+    def _wait_for_daemon(self):
+        """Block until the daemon has spoken every line handed to it"""
+        while self._tts_pending and self._tts is not None:
+            if not self._tts.stdout.readline():
+                # Daemon exited; nothing more will be spoken
+                self._tts = None
+                self._tts_pending = 0
+                return
+            self._tts_pending -= 1
+    
+    def _run_tts(self, cmd: List[str], blocking: bool, input_text: Optional[str] = None):
+        """Run a per-utterance TTS command
+        
+        Args:
+            cmd: TTS command line
+            blocking: Wait for playback to finish; otherwise keep the process
+                in self._current_tts for wait_for_tts()
+            input_text: Text to send on stdin, if the command reads it there
+        """
+        # Never talk over the previous utterance
+        self.wait_for_tts()
+        
+        if blocking:
+            subprocess.run(cmd, input=input_text, text=True, check=True)
+            return
+        
+        stdin = subprocess.DEVNULL if input_text is None else subprocess.PIPE
+        process = subprocess.Popen(cmd, stdin=stdin, text=True)
+        self._current_tts = process
+        if input_text is not None:
+            process.stdin.write(input_text)
+            process.stdin.close()
+    
+    def _speak_mac(self, text: str, blocking: bool) -> bool:
+        self._run_tts(["say", text], blocking)
+        return True
+    
+    def _speak_linux(self, text: str, blocking: bool) -> bool:
+        if not self._speak_daemon(text, blocking):
+            self._run_tts(["espeak", text], blocking)
+        return True
+    
+    def _speak_windows(self, text: str, blocking: bool) -> bool:
+        if not self._speak_daemon(text, blocking):
+            # Text goes through stdin, never into the PowerShell script
+            self._run_tts(WINDOWS_TTS_COMMAND, blocking, " ".join(text.split()))
+        return True
+    
+    def _speak_stub(self, text: str, blocking: bool) -> bool:
+        print(f"🔊 SYSTEM SPEAKING: {text}")
+        return True
+    
+    def speak(self, text: str, blocking: bool = True) -> bool:
+        """Use system text-to-speech to speak text
+        
+        Args:
+            text: Text to speak
+            blocking: Wait until playback finishes. With False, speech runs in
+                the background; call wait_for_tts() before listening so the
+                microphone does not pick it up.
+            
+        Returns:
+            True (text output is used when TTS fails)
+        """
+        try:
+            return self._speak_impl(text, blocking)
         except subprocess.CalledProcessError:
             # Fallback to text output
             print(f"🔊 SYSTEM SPEAKING: {text}")
@@ -42,14 +202,36 @@ class SimpleVoiceInterface:
             print(f"🔊 SYSTEM SPEAKING: {text}")
             return True
     
+    def wait_for_tts(self):
+        """Wait for speech started with blocking=False to finish"""
+        self._wait_for_daemon()
+        if self._current_tts is not None:
+            self._current_tts.wait()
+            self._current_tts = None
+    
+    def speak_stream(self, sentences: Iterable[str]) -> bool:
+        """Speak text as it arrives, e.g. sentences streamed from the LLM
+        
+        Each sentence is spoken as soon as it arrives, and the next one is
+        read from the stream while it plays, so speech starts with the first
+        sentence instead of the whole text. Returns once everything has been
+        spoken.
+        """
+        try:
+            for sentence in sentences:
+                self.speak(sentence, blocking=False)
+        finally:
+            self.wait_for_tts()
+        
+        return True
+    
     def listen(self, timeout: int = 5, phrase_timeout: int = 2) -> Optional[str]:
         """Listen for voice input with speech recognition"""
+        if self._recognizer is None:
+            return self._text_fallback()
+        
         try:
-            # Try to use enhanced speech recognition
-            from speech_recognition_helper import SpeechRecognizer
-            
-            recognizer = SpeechRecognizer()
-            result = recognizer.listen(timeout=timeout, prompt="🎤 Listening for your voice command...")
+            result = self._recognizer.listen(timeout=timeout, prompt="🎤 Listening for your voice command...")
             
             if result:
                 return result
@@ -57,9 +239,6 @@ class SimpleVoiceInterface:
                 print("No speech detected, falling back to text input...")
                 return self._text_fallback()
                 
-        except ImportError:
-            logger.warning("Speech recognition not available, using text input")
-            return self._text_fallback()
         except Exception as e:
             logger.warning(f"Speech recognition failed: {e}, using text input")
             return self._text_fallback()
@@ -110,7 +289,7 @@ class SimpleVoiceInterface:
             print(f"\n✅ Response: {result}\n")
             
             # Check if conversation should end
-            if any(word in result.lower() for word in ["completed", "acknowledged", "successful"]):
+            if COMPLETION_RE.search(result) is not None:
                 self.speak("Thank you. Security response completed.")
                 break
             
@@ -128,8 +307,10 @@ class SimpleVoiceInterface:
         print("CRITICAL SECURITY ALERT")
         print("🚨" * 25)
         
-        self.speak(message)
+        # Print the alert while it is spoken, but finish speaking before listening
+        self.speak(message, blocking=False)
         print(f"\nAlert: {message}\n")
+        self.wait_for_tts()
         
         if wait_for_response:
             return self.listen(timeout=15)
@@ -138,8 +319,30 @@ class SimpleVoiceInterface:
     
     def stop_conversation(self):
         """Stop the conversation"""
+        self.close()
         logger.info("Conversation stopped")
     
+    def close(self):
+        """Stop the TTS daemon and any background speech"""
+        if self._current_tts is not None:
+            self._current_tts.terminate()
+            self._current_tts = None
+        if self._tts is None:
+            return
+        try:
+            self._tts.stdin.close()
+        except OSError:
+            pass
+        self._tts.terminate()
+        self._tts = None
+        self._tts_pending = 0
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
     def test_audio_system(self) -> bool:
         """Test the audio system"""
         print("\n🔧 Testing audio system...")
@@ -160,19 +363,21 @@ def create_simple_voice_interface():
 
 if __name__ == "__main__":
     # Test the simple interface
+    CMD_RE = re.compile(r"patch|quarantine|isolate|acknowledge|status|shutdown", re.IGNORECASE)
+    CMD_RESPONSES = {
+        "patch": "Patching process initiated successfully.",
+        "quarantine": "Systems have been quarantined successfully.",
+        "isolate": "Systems have been quarantined successfully.",
+        "acknowledge": "Incident acknowledged and logged.",
+        "status": "System status check completed. All systems operational.",
+        "shutdown": "Emergency shutdown sequence initiated.",
+    }
+    
     def test_command_handler(command: str) -> str:
-        if "patch" in command.lower():
-            return "Patching process initiated successfully."
-        elif "quarantine" in command.lower() or "isolate" in command.lower():
-            return "Systems have been quarantined successfully."
-        elif "acknowledge" in command.lower():
-            return "Incident acknowledged and logged."
-        elif "status" in command.lower():
-            return "System status check completed. All systems operational."
-        elif "shutdown" in command.lower():
-            return "Emergency shutdown sequence initiated."
-        else:
-            return "Unknown command. Available commands: patch, quarantine, acknowledge, status, shutdown."
+        match = CMD_RE.search(command)
+        if match:
+            return CMD_RESPONSES[match.group().lower()]
+        return "Unknown command. Available commands: patch, quarantine, acknowledge, status, shutdown."
     
     # Test the interface
     interface = create_simple_voice_interface()
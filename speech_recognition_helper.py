@@ -6,15 +6,301 @@ Provides multiple methods for speech-to-text without PyAudio dependency
 """
 
 import os
+import io
+import re
 import sys
+import time
+import queue
+import base64
+import threading
+import shutil
 import subprocess
 import tempfile
 import json
+import hashlib
+import secrets
+import asyncio
 import platform
-from typing import Optional, Dict, Any
+import importlib.util
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, Iterable, List
 import requests
 from loguru import logger
 
+# A command result containing any of these ends the conversation
+COMPLETION_RE = re.compile(r"completed|acknowledged|successful", re.IGNORECASE)
+
+# PATH lookups without spawning `which`; tools do not move while we run
+_which = lru_cache(maxsize=None)(shutil.which)
+
+# Whitespace following a sentence terminator
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+# Fixed lines spoken by EnhancedVoiceInterface.start_conversation
+CONVERSATION_PROMPTS = (
+    "What would you like to do?",
+    "I didn't hear you clearly. Please try again.",
+    "No response received. Ending conversation.",
+    "Security response completed. Thank you.",
+)
+
+# Long-lived recognizer: reads a timeout in seconds per stdin line and
+# writes one line with the recognized text (empty if nothing was heard)
+WINDOWS_STT_SCRIPT = """
+Add-Type -AssemblyName System.Speech
+$recognizer = New-Object System.Speech.Recognition.SpeechRecognitionEngine
+$recognizer.SetInputToDefaultAudioDevice()
+$recognizer.LoadGrammar((New-Object System.Speech.Recognition.DictationGrammar))
+while (($line = [Console]::In.ReadLine()) -ne $null) {
+    $result = $null
+    try { $result = $recognizer.Recognize([TimeSpan]::FromSeconds([int]$line)) } catch {}
+    if ($result) { [Console]::Out.WriteLine($result.Text) } else { [Console]::Out.WriteLine("") }
+    [Console]::Out.Flush()
+}
+$recognizer.Dispose()
+"""
+
+WINDOWS_STT_COMMAND = [
+    "powershell", "-NoProfile", "-NonInteractive", "-EncodedCommand",
+    base64.b64encode(WINDOWS_STT_SCRIPT.encode("utf-16-le")).decode("ascii"),
+]
+
+# SpeechVoiceSpeakFlags.SVSFlagsAsync: queue the text and return immediately
+SVSF_ASYNC = 1
+
+# Browser page for _web_speech_api. Static, so it is encoded once; the page
+# polls for the current prompt and POSTs each recognized command back.
+_WEB_SPEECH_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <title>VoiceAlert Speech Input</title>
+    <style>
+        body { 
+            font-family: Arial, sans-serif; 
+            text-align: center; 
+            padding: 50px;
+            background: #1a1a1a;
+            color: #fff;
+        }
+        button {
+            padding: 20px 40px;
+            font-size: 18px;
+            background: #4CAF50;
+            color: white;
+            border: none;
+            border-radius: 5px;
+            cursor: pointer;
+            margin: 20px;
+        }
+        button:hover { background: #45a049; }
+        #result {
+            font-size: 24px;
+            margin: 30px;
+            padding: 20px;
+            background: #333;
+            border-radius: 5px;
+        }
+        .recording { background: #f44336 !important; }
+    </style>
+</head>
+<body>
+    <h1>🚨 VoiceAlert Voice Command</h1>
+    <p id="prompt">Click the button and speak your command</p>
+    <button id="startBtn" onclick="startRecording()">🎤 Start Recording</button>
+    <button onclick="submitResult()">✅ Submit Command</button>
+    <div id="result">Ready to record...</div>
+    
+    <script>
+        let recognition;
+        let finalTranscript = '';
+        
+        if ('webkitSpeechRecognition' in window) {
+            recognition = new webkitSpeechRecognition();
+        } else if ('SpeechRecognition' in window) {
+            recognition = new SpeechRecognition();
+        } else {
+            document.getElementById('result').textContent = 'Speech recognition not supported';
+        }
+        
+        if (recognition) {
+            recognition.continuous = true;
+            recognition.interimResults = true;
+            
+            recognition.onstart = function() {
+                document.getElementById('startBtn').textContent = '🛑 Stop Recording';
+                document.getElementById('startBtn').className = 'recording';
+                document.getElementById('result').textContent = 'Listening...';
+            };
+            
+            recognition.onresult = function(event) {
+                let interimTranscript = '';
+                
+                for (let i = event.resultIndex; i < event.results.length; i++) {
+                    if (event.results[i].isFinal) {
+                        finalTranscript += event.results[i][0].transcript;
+                    } else {
+                        interimTranscript += event.results[i][0].transcript;
+                    }
+                }
+                
+                document.getElementById('result').textContent = 
+                    finalTranscript + ' ' + interimTranscript;
+            };
+            
+            recognition.onend = function() {
+                document.getElementById('startBtn').textContent = '🎤 Start Recording';
+                document.getElementById('startBtn').className = '';
+            };
+        }
+        
+        function startRecording() {
+            if (recognition) {
+                if (document.getElementById('startBtn').textContent.includes('Stop')) {
+                    recognition.stop();
+                } else {
+                    finalTranscript = '';
+                    recognition.start();
+                }
+            }
+        }
+        
+        function submitResult() {
+            const result = document.getElementById('result').textContent;
+            if (result && result !== 'Ready to record...' && result !== 'Listening...') {
+                // Send to the Python backend, then get ready for the next turn
+                fetch('result', { method: 'POST', body: result.trim() });
+                finalTranscript = '';
+                document.getElementById('result').textContent = 'Ready to record...';
+            } else {
+                alert('Please record a voice command first');
+            }
+        }
+        
+        // Show the prompt of the turn that is waiting for an answer
+        setInterval(function() {
+            fetch('prompt').then(r => r.text()).then(function(text) {
+                if (text) {
+                    document.getElementById('prompt').textContent = text;
+                }
+            });
+        }, 1000);
+    </script>
+</body>
+</html>
+""".encode("utf-8")
+
+class _WebSpeechServer:
+    """Local HTTP server for the Web Speech API page"""
+    
+    def __init__(self):
+        self.prompt = ""
+        self.results = queue.Queue()
+        # Unguessable path so other local pages cannot post commands
+        base = f"/{secrets.token_urlsafe(16)}/"
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == base:
+                    self._reply(_WEB_SPEECH_PAGE, "text/html; charset=utf-8")
+                elif self.path == base + "prompt":
+                    self._reply(server.prompt.encode("utf-8"), "text/plain; charset=utf-8")
+                else:
+                    self.send_error(404)
+            
+            def do_POST(self):
+                if self.path != base + "result":
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                server.results.put(self.rfile.read(length).decode("utf-8", "replace"))
+                self.send_response(204)
+                self.end_headers()
+            
+            def _reply(self, body: bytes, content_type: str):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}{base}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+_WEB_SPEECH_SERVER = None
+
+def _get_web_speech_server():
+    """Start the Web Speech page server on first use
+    
+    Returns:
+        Tuple of (server, whether it was started by this call)
+    """
+    global _WEB_SPEECH_SERVER
+    if _WEB_SPEECH_SERVER is None:
+        _WEB_SPEECH_SERVER = _WebSpeechServer()
+        return _WEB_SPEECH_SERVER, True
+    return _WEB_SPEECH_SERVER, False
+
+# STT models take seconds to load; every recognizer in the process shares
+# one instance per model
+
+@lru_cache(maxsize=None)
+def _get_stt_model(name: str = "tiny.en"):
+    """Load a faster-whisper model (int8 on CPU) once per process"""
+    from faster_whisper import WhisperModel
+    return WhisperModel(name, device="cpu", compute_type="int8")
+
+@lru_cache(maxsize=None)
+def _get_vosk_model(model_path: Optional[str] = None):
+    """Load a Vosk model once per process (model_path, or the small English model)"""
+    import vosk
+    vosk.SetLogLevel(-1)
+    return vosk.Model(model_path) if model_path else vosk.Model(lang="en-us")
+
+async def ainput(prompt: str = "") -> str:
+    """Read a line from stdin without blocking the event loop
+    
+    Args:
+        prompt: Text printed before reading
+        
+    Returns:
+        The line, without its trailing newline
+        
+    Raises:
+        EOFError: stdin was closed
+    """
+    print(prompt, end="", flush=True)
+    loop = asyncio.get_running_loop()
+    line_ready = loop.create_future()
+    
+    def on_readable():
+        if not line_ready.done():
+            line_ready.set_result(sys.stdin.readline())
+    
+    try:
+        fd = sys.stdin.fileno()
+        loop.add_reader(fd, on_readable)
+    except (NotImplementedError, ValueError, OSError):
+        # Windows event loops cannot watch stdin; read it on a worker thread
+        return await asyncio.to_thread(input)
+    
+    try:
+        line = await line_ready
+    finally:
+        loop.remove_reader(fd)
+    
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
 class SpeechRecognizer:
     """Cross-platform speech recognition without PyAudio"""
     
@@ -22,6 +308,16 @@ class SpeechRecognizer:
         self.system = platform.system()
         self.recognition_methods = []
         
+        # speech_recognition state, kept across turns so the 1s ambient
+        # noise calibration is not repeated on every listen()
+        self._sr_recognizer = None
+        self._microphone = None
+        self._last_calibration = None
+        self.calibration_interval = 300  # seconds
+        
+        # Windows recognizer host, started on first use
+        self._sapi_host = None
+        
         # Check available recognition methods
         self._detect_available_methods()
         logger.info(f"Available recognition methods: {self.recognition_methods}")
@@ -29,16 +325,21 @@ class SpeechRecognizer:
     def _detect_available_methods(self):
         """Detect which speech recognition methods are available"""
         
+        # Packages are located, not imported: importing vosk or the pyobjc
+        # frameworks takes far longer than the check. A method whose import
+        # fails later is skipped by listen().
+        
+        # Local streaming recognition (returns as soon as the phrase ends)
+        if self._module_available("vosk") and self._module_available("sounddevice"):
+            self.recognition_methods.append("streaming_recognition")
+        
         # Python speech_recognition library (best option if available)
-        try:
-            import speech_recognition as sr
+        if self._module_available("speech_recognition"):
             self.recognition_methods.append("python_speech_recognition")
-        except ImportError:
-            pass
         
-        # macOS - built-in dictation
+        # macOS - on-device Speech framework (pyobjc)
         if self.system == "Darwin":
-            if self._check_command_exists("osascript"):
+            if self._module_available("Speech") and self._module_available("AVFoundation"):
                 self.recognition_methods.append("macos_dictation")
         
         # Windows - built-in speech recognition  
@@ -47,7 +348,7 @@ class SpeechRecognizer:
         
         # Linux - try various options
         elif self.system == "Linux":
-            if self._check_command_exists("arecord") and self._check_command_exists("sox"):
+            if self._check_command_exists("arecord"):
                 self.recognition_methods.append("linux_recording")
         
         # Web-based recognition (cross-platform)
@@ -56,16 +357,16 @@ class SpeechRecognizer:
         # Fallback - text input
         self.recognition_methods.append("text_fallback")
     
-    def _check_command_exists(self, command: str) -> bool:
-        """Check if a system command exists"""
-        try:
-            subprocess.run([command, "--help"], 
-                         capture_output=True, 
-                         check=False, 
-                         timeout=2)
-            return True
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _module_available(name: str) -> bool:
+        """Check if a Python module is installed without importing it (memoized)"""
+        return importlib.util.find_spec(name) is not None
+    
+    @staticmethod
+    def _check_command_exists(command: str) -> bool:
+        """Check if a system command exists on PATH (memoized, no subprocess)"""
+        return _which(command) is not None
     
     def listen(self, timeout: int = 10, prompt: str = "Speak now...") -> Optional[str]:
         """Listen for speech input using best available method
@@ -92,10 +393,44 @@ class SpeechRecognizer:
         logger.error("All speech recognition methods failed")
         return None
     
+    async def alisten(self, timeout: int = 10, prompt: str = "Speak now...") -> Optional[str]:
+        """Listen like listen() without blocking the event loop
+        
+        Microphone methods run on a worker thread and typed input is read
+        through the event loop, so other tasks (such as speaking the next
+        prompt) keep running while the user answers.
+        
+        Args:
+            timeout: Maximum time to wait for speech
+            prompt: Message to display to user
+            
+        Returns:
+            Recognized text or None
+        """
+        logger.info(f"Listening for speech: {prompt}")
+        
+        for method in self.recognition_methods:
+            try:
+                if method == "text_fallback":
+                    result = await self._atext_fallback(prompt)
+                else:
+                    result = await asyncio.to_thread(self._try_recognition_method, method, timeout, prompt)
+                if result:
+                    logger.info(f"Speech recognized via {method}: '{result}'")
+                    return result.strip().lower()
+            except Exception as e:
+                logger.warning(f"Recognition method {method} failed: {e}")
+                continue
+        
+        logger.error("All speech recognition methods failed")
+        return None
+    
     def _try_recognition_method(self, method: str, timeout: int, prompt: str) -> Optional[str]:
         """Try a specific recognition method"""
         
-        if method == "python_speech_recognition":
+        if method == "streaming_recognition":
+            return self._streaming_recognition(timeout, prompt)
+        elif method == "python_speech_recognition":
             return self._python_speech_recognition(timeout, prompt)
         elif method == "macos_dictation":
             return self._macos_dictation(timeout, prompt)
@@ -110,22 +445,122 @@ class SpeechRecognizer:
         else:
             return None
     
+    def _faster_whisper(self, audio) -> Optional[str]:
+        """Transcribe audio on-device with faster-whisper
+        
+        Args:
+            audio: Path to an audio file, or a binary file-like object
+            
+        Returns:
+            Transcribed text, or None when faster-whisper is not installed
+            or nothing was said
+        """
+        try:
+            model = _get_stt_model(os.getenv("WHISPER_MODEL", "tiny.en"))
+        except ImportError:
+            return None
+        
+        segments, _ = model.transcribe(audio, vad_filter=True, beam_size=1)
+        text = " ".join(segment.text.strip() for segment in segments)
+        return text or None
+    
+    def _streaming_recognition(self, timeout: int, prompt: str) -> Optional[str]:
+        """Recognize speech locally with Vosk while the user is still talking
+        
+        Audio arrives in 30ms blocks from the sound card thread and is decoded
+        as it arrives. Returns as soon as Vosk finalizes a phrase, or after
+        500ms of silence (webrtcvad, when installed), instead of waiting out
+        the full timeout.
+        """
+        import vosk
+        import sounddevice as sd
+        try:
+            import webrtcvad
+            vad = webrtcvad.Vad(3)
+        except ImportError:
+            vad = None
+        
+        sample_rate = 16000
+        block_ms = 30
+        recognizer = vosk.KaldiRecognizer(_get_vosk_model(os.getenv("VOSK_MODEL_PATH")), sample_rate)
+        blocks = queue.Queue()
+        
+        def on_audio(indata, frames, time_info, status):
+            blocks.put(bytes(indata))
+        
+        print(f"\n🎤 {prompt}")
+        
+        deadline = time.monotonic() + timeout
+        heard_speech = False
+        silence_ms = 0
+        partial = ""
+        
+        with sd.RawInputStream(samplerate=sample_rate, blocksize=sample_rate * block_ms // 1000,
+                               dtype="int16", channels=1, callback=on_audio):
+            while time.monotonic() < deadline:
+                try:
+                    block = blocks.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                
+                if recognizer.AcceptWaveform(block):
+                    text = json.loads(recognizer.Result()).get("text", "")
+                    if text:
+                        print()
+                        return text
+                else:
+                    hypothesis = json.loads(recognizer.PartialResult()).get("partial", "")
+                    if hypothesis and hypothesis != partial:
+                        partial = hypothesis
+                        print(f"\r🔄 {partial}", end="", flush=True)
+                
+                if vad is not None:
+                    if vad.is_speech(block, sample_rate):
+                        heard_speech = True
+                        silence_ms = 0
+                    elif heard_speech:
+                        silence_ms += block_ms
+                        if silence_ms >= 500:
+                            break
+        
+        if partial:
+            print()
+        text = json.loads(recognizer.FinalResult()).get("text", "")
+        return text or None
+    
+    def _calibrated_microphone(self, sr):
+        """Get the shared recognizer and microphone, calibrating when stale
+        
+        Args:
+            sr: The speech_recognition module
+            
+        Returns:
+            Tuple of (recognizer, microphone)
+        """
+        if self._microphone is None:
+            print("Initializing microphone...")
+            self._sr_recognizer = sr.Recognizer()
+            self._microphone = sr.Microphone()
+        
+        now = time.monotonic()
+        if self._last_calibration is None or now - self._last_calibration > self.calibration_interval:
+            print("Calibrating for ambient noise...")
+            with self._microphone as source:
+                self._sr_recognizer.adjust_for_ambient_noise(source, duration=1)
+            # Keep the calibrated threshold rather than letting it drift between turns
+            self._sr_recognizer.dynamic_energy_threshold = False
+            self._last_calibration = now
+        
+        return self._sr_recognizer, self._microphone
+    
     def _python_speech_recognition(self, timeout: int, prompt: str) -> Optional[str]:
         """Use Python speech_recognition library"""
         try:
             import speech_recognition as sr
             
             print(f"\n🎤 {prompt}")
-            print("Initializing microphone...")
-            
-            # Initialize recognizer and microphone
-            recognizer = sr.Recognizer()
-            microphone = sr.Microphone()
             
-            # Adjust for ambient noise
-            print("Calibrating for ambient noise...")
-            with microphone as source:
-                recognizer.adjust_for_ambient_noise(source, duration=1)
+            recognizer, microphone = self._calibrated_microphone(sr)
             
             print(f"🎤 Speak now for up to {timeout} seconds...")
             
@@ -135,8 +570,10 @@ class SpeechRecognizer:
             
             print("🔄 Processing speech...")
             
-            # Recognize speech using Google's free service
-            text = recognizer.recognize_google(audio)
+            # Prefer on-device Whisper; fall back to Google's free service
+            text = self._faster_whisper(io.BytesIO(audio.get_wav_data()))
+            if text is None:
+                text = recognizer.recognize_google(audio)
             
             print(f"✅ Recognized: '{text}'")
             return text.lower().strip()
@@ -158,229 +595,183 @@ class SpeechRecognizer:
             return None
     
     def _macos_dictation(self, timeout: int, prompt: str) -> Optional[str]:
-        """Use macOS built-in dictation via AppleScript"""
-        print(f"\n🎤 {prompt}")
-        print("⚠️  macOS dictation disabled to prevent file opening issues")
-        print("🔄 Skipping to text input...")
+        """Use macOS on-device speech recognition (Speech framework via pyobjc)
+        
+        Microphone audio is streamed into an SFSpeechRecognizer. Listening
+        stops once the transcript has not changed for a second, rather than
+        after the full timeout.
+        """
+        import Speech
+        import AVFoundation
+        from Foundation import NSDate, NSLocale, NSRunLoop
         
-        # Skip the TextEdit approach that causes file opening issues
-        # Go directly to text input fallback
-        return self._text_fallback(prompt)
-    
-    def _windows_sapi(self, timeout: int, prompt: str) -> Optional[str]:
-        """Use Windows Speech API"""
         print(f"\n🎤 {prompt}")
         
-        # PowerShell script for speech recognition
-        ps_script = f'''
-        Add-Type -AssemblyName System.Speech
-        $recognizer = New-Object System.Speech.Recognition.SpeechRecognitionEngine
-        $recognizer.SetInputToDefaultAudioDevice()
+        Speech.SFSpeechRecognizer.requestAuthorization_(lambda status: None)
+        recognizer = Speech.SFSpeechRecognizer.alloc().initWithLocale_(
+            NSLocale.localeWithLocaleIdentifier_("en-US"))
+        if recognizer is None or not recognizer.isAvailable():
+            logger.warning("macOS speech recognizer is not available")
+            return None
+        
+        request = Speech.SFSpeechAudioBufferRecognitionRequest.alloc().init()
+        request.setShouldReportPartialResults_(True)
+        if recognizer.supportsOnDeviceRecognition():
+            request.setRequiresOnDeviceRecognition_(True)
         
-        $grammar = New-Object System.Speech.Recognition.DictationGrammar
-        $recognizer.LoadGrammar($grammar)
+        state = {"text": None, "final": False, "updated": time.monotonic()}
         
-        $recognizer.RecognizeTimeout = New-TimeSpan -Seconds {timeout}
+        def on_result(result, error):
+            if result is not None:
+                state["text"] = str(result.bestTranscription().formattedString())
+                state["updated"] = time.monotonic()
+                state["final"] = bool(result.isFinal())
+            if error is not None:
+                state["final"] = True
         
-        try {{
-            $result = $recognizer.Recognize()
-            if ($result) {{
-                Write-Output $result.Text
-            }} else {{
-                Write-Output ""
-            }}
-        }} catch {{
-            Write-Output ""
-        }}
+        engine = AVFoundation.AVAudioEngine.alloc().init()
+        input_node = engine.inputNode()
+        input_node.installTapOnBus_bufferSize_format_block_(
+            0, 1024, input_node.outputFormatForBus_(0),
+            lambda buffer, when: request.appendAudioPCMBuffer_(buffer))
+        task = recognizer.recognitionTaskWithRequest_resultHandler_(request, on_result)
         
-        $recognizer.Dispose()
-        '''
+        engine.prepare()
+        started, error = engine.startAndReturnError_(None)
+        if not started:
+            input_node.removeTapOnBus_(0)
+            task.cancel()
+            logger.warning(f"Could not start the microphone: {error}")
+            return None
+        
+        def run_until(done, deadline):
+            while not done() and time.monotonic() < deadline:
+                NSRunLoop.currentRunLoop().runUntilDate_(NSDate.dateWithTimeIntervalSinceNow_(0.05))
         
         try:
-            result = subprocess.run(
-                ["powershell", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=timeout + 5
+            # Listen until a second passes without the transcript changing
+            run_until(lambda: state["final"] or (state["text"] and time.monotonic() - state["updated"] > 1.0),
+                      time.monotonic() + timeout)
+        finally:
+            engine.stop()
+            input_node.removeTapOnBus_(0)
+            request.endAudio()
+        
+        # Give the recognizer a moment to deliver the final transcript
+        run_until(lambda: state["final"], time.monotonic() + 1.0)
+        task.finish()
+        
+        return state["text"] or None
+    
+    def _windows_sapi(self, timeout: int, prompt: str) -> Optional[str]:
+        """Use Windows Speech API
+        
+        One PowerShell process keeps the recognition engine loaded between
+        turns, so only the first call pays PowerShell and System.Speech
+        start-up.
+        """
+        print(f"\n🎤 {prompt}")
+        
+        if self._sapi_host is None or self._sapi_host.poll() is not None:
+            self._sapi_host = subprocess.Popen(
+                WINDOWS_STT_COMMAND,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
             )
-            
-            if result.returncode == 0 and result.stdout.strip():
-                return result.stdout.strip()
-            
-        except subprocess.TimeoutExpired:
+        host = self._sapi_host
+        
+        # Kill a hung recognizer rather than blocking the conversation
+        watchdog = threading.Timer(timeout + 5, host.kill)
+        watchdog.start()
+        try:
+            host.stdin.write(f"{int(timeout)}\n")
+            host.stdin.flush()
+            line = host.stdout.readline()
+        except OSError:
+            line = ""
+        finally:
+            watchdog.cancel()
+        
+        if not line:
+            # The host exited or was killed; start a new one next time
+            self._sapi_host = None
             logger.warning("Windows speech recognition timed out")
+            return None
         
-        return None
+        return line.strip() or None
     
     def _linux_recording(self, timeout: int, prompt: str) -> Optional[str]:
-        """Record audio on Linux and use online STT service"""
+        """Record audio on Linux and transcribe it"""
         print(f"\n🎤 {prompt}")
         print(f"Recording for {timeout} seconds...")
         
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            audio_file = temp_file.name
-        
         try:
-            # Record audio using arecord
-            subprocess.run([
+            # Record 16 kHz mono directly, the format STT models expect, and
+            # take the WAV from stdout rather than a temp file
+            result = subprocess.run([
                 "arecord", 
-                "-f", "cd",  # CD quality
+                "-q",
+                "-f", "S16_LE",
+                "-r", "16000",
+                "-c", "1",
                 "-t", "wav",
                 "-d", str(timeout),
-                audio_file
-            ], check=True, timeout=timeout + 5)
-            
-            # Convert to format suitable for web APIs using sox if available
-            if self._check_command_exists("sox"):
-                converted_file = audio_file + "_converted.wav"
-                subprocess.run([
-                    "sox", audio_file, "-r", "16000", "-c", "1", converted_file
-                ], check=True)
-                audio_file = converted_file
+                "-"
+            ], check=True, capture_output=True, timeout=timeout + 5)
             
-            # Use the audio file with web speech API
-            return self._transcribe_audio_file(audio_file)
+            return self._transcribe_audio_file(io.BytesIO(result.stdout))
             
         except subprocess.CalledProcessError as e:
             logger.error(f"Audio recording failed: {e}")
             return None
-        finally:
-            # Clean up temp files
-            try:
-                os.unlink(audio_file)
-                if os.path.exists(audio_file + "_converted.wav"):
-                    os.unlink(audio_file + "_converted.wav")
-            except:
-                pass
     
-    def _transcribe_audio_file(self, audio_file: str) -> Optional[str]:
-        """Transcribe audio file using a web service"""
-        # This would use a service like Google Cloud Speech-to-Text
-        # For demo purposes, we'll simulate it
-        logger.info(f"Would transcribe audio file: {audio_file}")
+    def _transcribe_audio_file(self, audio) -> Optional[str]:
+        """Transcribe audio on-device, or ask the user to type it
+        
+        Args:
+            audio: Path to an audio file, or a binary file-like object
+        """
+        text = self._faster_whisper(audio)
+        if text is not None:
+            return text
+        
+        # Without faster-whisper this would need a cloud STT service
+        logger.info("Would transcribe recorded audio")
         print("⚠️  Audio transcription would require cloud STT service setup")
         print("Please type what you said:")
         return input("Your command: ").strip()
     
     def _web_speech_api(self, timeout: int, prompt: str) -> Optional[str]:
-        """Use web-based speech recognition via JavaScript"""
+        """Use web-based speech recognition via JavaScript
+        
+        With WEB_SPEECH_UI=true a local page runs the browser's Web Speech
+        API and posts each command back. The browser is opened on the first
+        turn and the same tab is reused for later turns.
+        """
         print(f"\n🎤 {prompt}")
-        print("This would open a web page for speech recognition...")
-        
-        # Create a simple HTML page with Web Speech API
-        html_content = f'''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>VoiceAlert Speech Input</title>
-            <style>
-                body {{ 
-                    font-family: Arial, sans-serif; 
-                    text-align: center; 
-                    padding: 50px;
-                    background: #1a1a1a;
-                    color: #fff;
-                }}
-                button {{
-                    padding: 20px 40px;
-                    font-size: 18px;
-                    background: #4CAF50;
-                    color: white;
-                    border: none;
-                    border-radius: 5px;
-                    cursor: pointer;
-                    margin: 20px;
-                }}
-                button:hover {{ background: #45a049; }}
-                #result {{
-                    font-size: 24px;
-                    margin: 30px;
-                    padding: 20px;
-                    background: #333;
-                    border-radius: 5px;
-                }}
-                .recording {{ background: #f44336 !important; }}
-            </style>
-        </head>
-        <body>
-            <h1>🚨 VoiceAlert Voice Command</h1>
-            <p>Click the button and speak your command</p>
-            <button id="startBtn" onclick="startRecording()">🎤 Start Recording</button>
-            <button onclick="submitResult()">✅ Submit Command</button>
-            <div id="result">Ready to record...</div>
-            
-            <script>
-                let recognition;
-                let finalTranscript = '';
-                
-                if ('webkitSpeechRecognition' in window) {{
-                    recognition = new webkitSpeechRecognition();
-                }} else if ('SpeechRecognition' in window) {{
-                    recognition = new SpeechRecognition();
-                }} else {{
-                    document.getElementById('result').textContent = 'Speech recognition not supported';
-                }}
-                
-                if (recognition) {{
-                    recognition.continuous = true;
-                    recognition.interimResults = true;
-                    
-                    recognition.onstart = function() {{
-                        document.getElementById('startBtn').textContent = '🛑 Stop Recording';
-                        document.getElementById('startBtn').className = 'recording';
-                        document.getElementById('result').textContent = 'Listening...';
-                    }};
-                    
-                    recognition.onresult = function(event) {{
-                        let interimTranscript = '';
-                        
-                        for (let i = event.resultIndex; i < event.results.length; i++) {{
-                            if (event.results[i].isFinal) {{
-                                finalTranscript += event.results[i][0].transcript;
-                            }} else {{
-                                interimTranscript += event.results[i][0].transcript;
-                            }}
-                        }}
-                        
-                        document.getElementById('result').textContent = 
-                            finalTranscript + ' ' + interimTranscript;
-                    }};
-                    
-                    recognition.onend = function() {{
-                        document.getElementById('startBtn').textContent = '🎤 Start Recording';
-                        document.getElementById('startBtn').className = '';
-                    }};
-                }}
-                
-                function startRecording() {{
-                    if (recognition) {{
-                        if (document.getElementById('startBtn').textContent.includes('Stop')) {{
-                            recognition.stop();
-                        }} else {{
-                            finalTranscript = '';
-                            recognition.start();
-                        }}
-                    }}
-                }}
-                
-                function submitResult() {{
-                    const result = document.getElementById('result').textContent;
-                    if (result && result !== 'Ready to record...' && result !== 'Listening...') {{
-                        alert('Command: ' + result);
-                        // In real implementation, would send to Python backend
-                        console.log('Voice command:', result);
-                    }} else {{
-                        alert('Please record a voice command first');
-                    }}
-                }}
-            </script>
-        </body>
-        </html>
-        '''
-        
-        # For now, fall back to text input
-        print("💡 Web Speech API would be implemented with browser interface")
-        return self._text_fallback(prompt)
+        
+        if os.getenv("WEB_SPEECH_UI", "false").lower() != "true":
+            print("💡 Web Speech API would be implemented with browser interface")
+            return self._text_fallback(prompt)
+        
+        server, started = _get_web_speech_server()
+        server.prompt = prompt
+        while not server.results.empty():
+            server.results.get_nowait()  # drop answers to earlier turns
+        
+        wait = timeout
+        if started:
+            import webbrowser
+            webbrowser.open(server.url)
+            wait += 15  # time for the browser to open
+        print(f"Speak your command in the browser page: {server.url}")
+        
+        try:
+            return server.results.get(timeout=wait).strip() or None
+        except queue.Empty:
+            return None
     
     def _text_fallback(self, prompt: str) -> Optional[str]:
         """Fallback to text input"""
@@ -391,6 +782,16 @@ class SpeechRecognizer:
             return response if response else None
         except (KeyboardInterrupt, EOFError):
             return None
+    
+    async def _atext_fallback(self, prompt: str) -> Optional[str]:
+        """Fallback to text input without blocking the event loop"""
+        print(f"\n💬 {prompt}")
+        print("Using text input as fallback...")
+        try:
+            response = (await ainput("🎤 Enter your voice command: ")).strip()
+            return response if response else None
+        except EOFError:
+            return None
 
 class EnhancedVoiceInterface:
     """Enhanced voice interface with real speech recognition"""
@@ -398,26 +799,247 @@ class EnhancedVoiceInterface:
     def __init__(self):
         self.speech_recognizer = SpeechRecognizer()
         self.system = platform.system()
+        # Resolved once rather than running `which` on every utterance
+        self._espeak = _which("espeak")
+        self._festival = _which("festival")
+        
+        # Playback started by speak_async()
+        self._current_speech = None
+        
+        # In-process SAPI voice on Windows, avoiding a PowerShell per utterance
+        self._sapi = None
+        if self.system == "Windows":
+            try:
+                import win32com.client
+                self._sapi = win32com.client.Dispatch("SAPI.SpVoice")
+            except Exception as e:
+                logger.debug(f"SAPI voice unavailable, using PowerShell: {e}")
+        
+        # Recorded audio for repeated phrases ("What would you like to do?"),
+        # replayed without running the speech synthesizer again. Recordings
+        # are kept on disk, so fixed prompts are reused across runs too
+        self._tts_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._tts_cache_size = 128
+        self._tts_cache_dir = None
+        self._tts_lock = threading.Lock()
+        self._tts_pending: Dict[str, Future] = {}  # recordings being synthesized
+        self._prefetch_pool = None
+        aplay = _which("aplay")
+        if self.system == "Darwin":
+            self._synth_cmd, self._play_cmd, self._audio_ext = ["say", "-o"], ["afplay"], ".aiff"
+        elif self.system == "Linux" and self._espeak and aplay:
+            self._synth_cmd, self._play_cmd, self._audio_ext = [self._espeak, "-w"], [aplay, "-q"], ".wav"
+        else:
+            self._synth_cmd = self._play_cmd = self._audio_ext = None
+        
         logger.info("Enhanced voice interface initialized")
     
-    def speak(self, text: str) -> bool:
-        """Use system text-to-speech"""
+    def _cached_audio(self, text: str) -> Optional[str]:
+        """Get a recording of text, synthesizing it on first use
+        
+        Args:
+            text: Text to speak
+            
+        Returns:
+            Path to the audio file, or None if this platform cannot record TTS
+        """
+        if self._synth_cmd is None:
+            return None
+        
+        # The synthesizer is part of the key so switching engines re-records
+        key = hashlib.blake2b(f"{self._synth_cmd[0]}|{text}".encode("utf-8"), digest_size=8).hexdigest()
+        with self._tts_lock:
+            if self._tts_cache_dir is None:
+                self._load_tts_cache()
+            
+            path = self._tts_cache.get(key)
+            if path is not None:
+                try:
+                    # Refresh mtime, which orders the LRU for the next run
+                    os.utime(path)
+                    self._tts_cache.move_to_end(key)
+                    return path
+                except OSError:
+                    # Evicted by another process sharing the directory
+                    del self._tts_cache[key]
+            
+            # Another thread (usually prefetch) is already recording this text
+            pending = self._tts_pending.get(key)
+            if pending is not None:
+                owner = False
+            else:
+                pending = self._tts_pending[key] = Future()
+                owner = True
+        
+        if not owner:
+            return pending.result()
+        
         try:
-            if self.system == "Darwin":  # macOS
-                subprocess.run(["say", text], check=True)
-            elif self.system == "Linux":
-                if subprocess.run(["which", "espeak"], capture_output=True).returncode == 0:
-                    subprocess.run(["espeak", text], check=True)
-                elif subprocess.run(["which", "festival"], capture_output=True).returncode == 0:
-                    subprocess.run(["echo", text, "|", "festival", "--tts"], shell=True, check=True)
-                else:
-                    print(f"🔊 SYSTEM: {text}")
-            elif self.system == "Windows":
-                ps_command = f'Add-Type -AssemblyName System.speech; (New-Object System.Speech.Synthesis.SpeechSynthesizer).Speak("{text}")'
-                subprocess.run(["powershell", "-Command", ps_command], check=True)
+            # Record to a scratch name so an interrupted run never leaves a
+            # truncated file behind for the next one
+            path = os.path.join(self._tts_cache_dir, key + self._audio_ext)
+            partial = os.path.join(self._tts_cache_dir, f"{key}.{os.getpid()}.part{self._audio_ext}")
+            subprocess.run(self._synth_cmd + [partial, text], check=True)
+            os.replace(partial, path)
+            
+            with self._tts_lock:
+                self._tts_cache[key] = path
+                evicted = None
+                if len(self._tts_cache) > self._tts_cache_size:
+                    _, evicted = self._tts_cache.popitem(last=False)
+            if evicted is not None:
+                try:
+                    os.remove(evicted)
+                except OSError:
+                    pass
+            pending.set_result(path)
+            return path
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._tts_lock:
+                self._tts_pending.pop(key, None)
+    
+    def _load_tts_cache(self):
+        """Open the recording directory and adopt recordings from earlier runs
+        
+        Called with _tts_lock held. The most recently used recordings are
+        loaded into the LRU, oldest first.
+        """
+        cache_dir = os.getenv("SPEECH_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "dasie", "speech")
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with os.scandir(cache_dir) as it:
+                recordings = [
+                    entry for entry in it
+                    if entry.name.endswith(self._audio_ext) and entry.name.count(".") == 1
+                ]
+        except OSError as e:
+            logger.debug(f"Speech cache directory unusable, recording to a temp dir: {e}")
+            self._tts_cache_dir = tempfile.mkdtemp(prefix="tts_cache_")
+            return
+        
+        recordings.sort(key=lambda entry: entry.stat().st_mtime)
+        stale, recent = recordings[:-self._tts_cache_size], recordings[-self._tts_cache_size:]
+        for entry in stale:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+        for entry in recent:
+            self._tts_cache[entry.name[:-len(self._audio_ext)]] = entry.path
+        self._tts_cache_dir = cache_dir
+    
+    def prefetch(self, texts: Iterable[str], max_workers: int = 3) -> List[Future]:
+        """Record upcoming phrases in the background so speaking them later
+        only has to play the audio
+        
+        Args:
+            texts: Phrases that will be spoken soon
+            max_workers: Maximum concurrent synthesizer processes
+            
+        Returns:
+            One future per sentence, resolving to its audio path
+        """
+        if self._synth_cmd is None:
+            return []
+        
+        if self._prefetch_pool is None:
+            self._prefetch_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts_prefetch")
+        return [
+            self._prefetch_pool.submit(self._cached_audio, sentence)
+            for text in texts
+            for sentence in SENTENCE_BOUNDARY.split(text.strip())
+        ]
+    
+    def _start_speech(self, text: str) -> Optional[subprocess.Popen]:
+        """Start speaking text without waiting for playback
+        
+        Multi-sentence text recorded to audio files returns once its last
+        sentence has started playing.
+        
+        Returns:
+            The playback process, or None when nothing runs in a subprocess
+        """
+        # Never talk over the previous utterance
+        self.wait_for_speech_end()
+        
+        if self._synth_cmd is not None:
+            # Render sentence by sentence: the next sentence is synthesized
+            # while the previous one plays, so speech starts after the first
+            # sentence rather than the whole message
+            playing = None
+            for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+                audio = self._cached_audio(sentence)
+                if playing is not None and playing.wait() != 0:
+                    raise subprocess.CalledProcessError(playing.returncode, playing.args)
+                playing = subprocess.Popen(self._play_cmd + [audio])
+            return playing
+        elif self.system == "Darwin":  # macOS
+            return subprocess.Popen(["say", text])
+        elif self.system == "Linux":
+            if self._espeak:
+                return subprocess.Popen([self._espeak, text])
+            elif self._festival:
+                process = subprocess.Popen([self._festival, "--tts"], stdin=subprocess.PIPE, text=True)
+                process.stdin.write(text)
+                process.stdin.close()
+                return process
             else:
                 print(f"🔊 SYSTEM: {text}")
+        elif self._sapi is not None:
+            self._sapi.Speak(text, SVSF_ASYNC)
+        elif self.system == "Windows":
+            from simple_voice_interface import WINDOWS_TTS_COMMAND
+            process = subprocess.Popen(WINDOWS_TTS_COMMAND, stdin=subprocess.PIPE, text=True)
+            process.stdin.write(" ".join(text.split()))
+            process.stdin.close()
+            return process
+        else:
+            print(f"🔊 SYSTEM: {text}")
+        return None
+    
+    def speak_async(self, text: str) -> Optional[subprocess.Popen]:
+        """Start speaking text and return while it plays
+        
+        Args:
+            text: Text to speak
             
+        Returns:
+            The playback process, or None if there is no process to wait on;
+            pass it to wait_for_speech_end()
+        """
+        try:
+            self._current_speech = self._start_speech(text)
+        except Exception as e:
+            logger.warning(f"TTS failed: {e}")
+            print(f"🔊 SYSTEM: {text}")
+            self._current_speech = None
+        return self._current_speech
+    
+    def wait_for_speech_end(self, process: Optional[subprocess.Popen] = None):
+        """Wait for playback started by speak_async() to finish
+        
+        Args:
+            process: Playback process; defaults to the most recent one
+        """
+        process = process or self._current_speech
+        if process is not None:
+            process.wait()
+            if process is self._current_speech:
+                self._current_speech = None
+        if self._sapi is not None:
+            self._sapi.WaitUntilDone(-1)
+    
+    def speak(self, text: str) -> bool:
+        """Use system text-to-speech"""
+        try:
+            process = self._start_speech(text)
+            if process is not None and process.wait() != 0:
+                raise subprocess.CalledProcessError(process.returncode, process.args)
+            if self._sapi is not None:
+                self._sapi.WaitUntilDone(-1)
             return True
         except Exception as e:
             logger.warning(f"TTS failed: {e}")
@@ -428,12 +1050,20 @@ class EnhancedVoiceInterface:
         """Listen for speech input"""
         return self.speech_recognizer.listen(timeout, prompt)
     
+    async def alisten(self, timeout: int = 10, prompt: str = "Speak your command...") -> Optional[str]:
+        """Listen for speech input without blocking the event loop"""
+        return await self.speech_recognizer.alisten(timeout, prompt)
+    
     def start_conversation(self, initial_message: str, command_callback) -> str:
         """Start voice conversation with real speech recognition"""
         print("\n" + "="*60)
         print("🚨 VOICE CONVERSATION WITH SPEECH RECOGNITION 🚨")
         print("="*60)
         
+        # Record the alert's sentences and the fixed replies in parallel, so
+        # the conversation below only has to play them
+        self.prefetch([initial_message, *CONVERSATION_PROMPTS])
+        
         # Speak initial message
         self.speak(initial_message)
         print(f"\nAlert Message:\n{initial_message}\n")
@@ -442,7 +1072,9 @@ class EnhancedVoiceInterface:
         max_attempts = 3
         
         while attempts < max_attempts:
-            self.speak("What would you like to do?")
+            # Start the microphone as soon as the prompt has been spoken
+            prompt = self.speak_async("What would you like to do?")
+            self.wait_for_speech_end(prompt)
             
             # Listen for voice input
             response = self.listen(timeout=15, prompt="Waiting for your voice command...")
@@ -461,12 +1093,12 @@ class EnhancedVoiceInterface:
             logger.info(f"Processing voice command: {response}")
             result = command_callback(response)
             
-            # Speak result
-            self.speak(result)
+            # Speak result; the next prompt waits for it to finish
+            self.speak_async(result)
             print(f"\n✅ Response: {result}\n")
             
             # Check if conversation should end
-            if any(word in result.lower() for word in ["completed", "acknowledged", "successful"]):
+            if COMPLETION_RE.search(result) is not None:
                 self.speak("Security response completed. Thank you.")
                 break
             
@@ -5,24 +5,31 @@ Test script for ElevenLabs agent conversation
 """
 
 from voice_interface import VoiceInterface
+from command_engine import build_keyword_matcher
 from loguru import logger
 
+# Keyword -> (priority, response). When several keywords occur the one
+# with the lowest priority wins, so "patch the status page" means patch.
+COMMAND_RESPONSES = {
+    "patch": (0, "Patching process initiated successfully."),
+    "quarantine": (1, "Systems have been quarantined successfully."),
+    "isolate": (1, "Systems have been quarantined successfully."),
+    "acknowledge": (2, "Incident acknowledged and logged."),
+    "ack": (2, "Incident acknowledged and logged."),
+    "status": (3, "System status check completed. All systems operational."),
+    "shutdown": (4, "Emergency shutdown sequence initiated."),
+}
+
+_match_commands = build_keyword_matcher(COMMAND_RESPONSES)
+
 def test_command_handler(command: str) -> str:
     """Handle voice commands for security alerts"""
     command = command.lower()
     
-    if "patch" in command:
-        return "Patching process initiated successfully."
-    elif "quarantine" in command or "isolate" in command:
-        return "Systems have been quarantined successfully."
-    elif "acknowledge" in command or "ack" in command:
-        return "Incident acknowledged and logged."
-    elif "status" in command:
-        return "System status check completed. All systems operational."
-    elif "shutdown" in command:
-        return "Emergency shutdown sequence initiated."
-    else:
-        return f"Unknown command '{command}'. Available commands: patch, quarantine, acknowledge, status, shutdown."
+    matches = _match_commands(command)
+    if matches:
+        return min(matches)[1]
+    return f"Unknown command '{command}'. Available commands: patch, quarantine, acknowledge, status, shutdown."
 
 def main():
     """Main test function"""
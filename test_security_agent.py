@@ -5,24 +5,32 @@ Test script focused on security incident response with ElevenLabs agent
 """
 
 from voice_interface import VoiceInterface
+from command_engine import build_keyword_matcher
 from loguru import logger
 
+# Keyword -> (priority, response). When several keywords occur the one
+# with the lowest priority wins, so "patch the status page" means patch.
+COMMAND_RESPONSES = {
+    "patch": (0, "Security patches are being applied to all affected systems. ETA: 15 minutes."),
+    "quarantine": (1, "Affected servers are being quarantined. Network isolation in progress."),
+    "isolate": (1, "Affected servers are being quarantined. Network isolation in progress."),
+    "acknowledge": (2, "Security incident CVE-2025-55182 acknowledged by security team."),
+    "ack": (2, "Security incident CVE-2025-55182 acknowledged by security team."),
+    "status": (3, "System status: 15 servers affected, patching in progress, no breach detected."),
+    "emergency": (4, "Emergency shutdown initiated for all affected systems."),
+    "shutdown": (4, "Emergency shutdown initiated for all affected systems."),
+}
+
+_match_commands = build_keyword_matcher(COMMAND_RESPONSES)
+
 def test_command_handler(command: str) -> str:
     """Handle security voice commands"""
     command = command.lower()
     
-    if "patch" in command:
-        return "Security patches are being applied to all affected systems. ETA: 15 minutes."
-    elif "quarantine" in command or "isolate" in command:
-        return "Affected servers are being quarantined. Network isolation in progress."
-    elif "acknowledge" in command or "ack" in command:
-        return "Security incident CVE-2025-55182 acknowledged by security team."
-    elif "status" in command:
-        return "System status: 15 servers affected, patching in progress, no breach detected."
-    elif "emergency" in command or "shutdown" in command:
-        return "Emergency shutdown initiated for all affected systems."
-    else:
-        return f"Security command received: '{command}'. Processing incident response."
+    matches = _match_commands(command)
+    if matches:
+        return min(matches)[1]
+    return f"Security command received: '{command}'. Processing incident response."
 
 def main():
     """Test security-focused agent conversation"""
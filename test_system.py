@@ -7,53 +7,29 @@ This script tests all components to ensure they work properly
 
 import os
 import sys
+import importlib.util
 from pathlib import Path
 
+# (module, package name) pairs probed by test_imports
+REQUIRED_MODULES = [
+    ("requests", "requests"),
+    ("openai", "openai"),
+    ("elevenlabs", "elevenlabs"),
+    ("dotenv", "python-dotenv"),
+    ("pydantic", "pydantic"),
+    ("loguru", "loguru"),
+]
+
 def test_imports():
     """Test that all required modules can be imported"""
     print("Testing imports...")
     
-    try:
-        import requests
-        print("✅ requests")
-    except ImportError as e:
-        print(f"❌ requests: {e}")
-        return False
-    
-    try:
-        import openai
-        print("✅ openai")
-    except ImportError as e:
-        print(f"❌ openai: {e}")
-        return False
-    
-    try:
-        import elevenlabs
-        print("✅ elevenlabs")
-    except ImportError as e:
-        print(f"❌ elevenlabs: {e}")
-        return False
-    
-    try:
-        from dotenv import load_dotenv
-        print("✅ python-dotenv")
-    except ImportError as e:
-        print(f"❌ python-dotenv: {e}")
-        return False
-    
-    try:
-        import pydantic
-        print("✅ pydantic")
-    except ImportError as e:
-        print(f"❌ pydantic: {e}")
-        return False
-    
-    try:
-        import loguru
-        print("✅ loguru")
-    except ImportError as e:
-        print(f"❌ loguru: {e}")
-        return False
+    # find_spec locates each package without executing its __init__
+    for module, package in REQUIRED_MODULES:
+        if importlib.util.find_spec(module) is None:
+            print(f"❌ {package}: No module named '{module}'")
+            return False
+        print(f"✅ {package}")
     
     return True
 
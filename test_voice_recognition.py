@@ -6,15 +6,29 @@ Tests real speech-to-text without complex dependencies
 """
 
 import sys
+import asyncio
 import platform
-from speech_recognition_helper import SpeechRecognizer, create_enhanced_voice_interface
-from command_engine import CommandEngine
+from functools import lru_cache
+
+@lru_cache(maxsize=1)
+def get_interface():
+    """Voice interface shared by every test (models and devices load once)"""
+    from speech_recognition_helper import create_enhanced_voice_interface
+    return create_enhanced_voice_interface()
+
+@lru_cache(maxsize=1)
+def get_engine():
+    """Command engine shared by every test"""
+    from command_engine import CommandEngine
+    return CommandEngine()
 
 def test_basic_speech_recognition():
     """Test basic speech recognition functionality"""
     print("Testing Basic Speech Recognition")
     print("=" * 40)
     
+    from speech_recognition_helper import SpeechRecognizer
+    
     recognizer = SpeechRecognizer()
     
     print(f"System: {platform.system()}")
@@ -39,7 +53,7 @@ def test_enhanced_voice_interface():
     print("=" * 40)
     
     try:
-        interface = create_enhanced_voice_interface()
+        interface = get_interface()
         
         # Test TTS
         interface.speak("Voice interface test. Can you hear me?")
@@ -66,8 +80,8 @@ def test_security_commands():
     print("\n\nTesting Security Command Recognition")
     print("=" * 40)
     
-    interface = create_enhanced_voice_interface()
-    engine = CommandEngine()
+    interface = get_interface()
+    engine = get_engine()
     
     def command_handler(command: str) -> str:
         return engine.process_voice_command(command, "CVE-2025-55182")
@@ -79,34 +93,68 @@ def test_security_commands():
         "status report"
     ]
     
-    interface.speak("I will test recognition of security commands.")
+    intro = "I will test recognition of security commands."
+    # (command, spoken prompt, listen prompt), built once
+    prompts = tuple((cmd, f"Please say: {cmd}", f"Say '{cmd}'") for cmd in test_commands)
     
-    for i, expected_cmd in enumerate(test_commands, 1):
-        print(f"\nTest {i}/4:")
-        interface.speak(f"Please say: {expected_cmd}")
-        
-        result = interface.listen(timeout=15, prompt=f"Say '{expected_cmd}'")
-        
-        if result:
-            print(f"You said: '{result}'")
-            
-            # Process the command
-            response = command_handler(result)
-            interface.speak(f"Command processed: {response[:50]}...")
-            
-            print(f"✅ Command '{expected_cmd}' test completed")
-        else:
-            print(f"❌ Failed to recognize '{expected_cmd}'")
+    # Record every fixed prompt in one parallel burst; the test below only
+    # plays them back
+    interface.prefetch([intro, *(speak_prompt for _, speak_prompt, _ in prompts)])
+    
+    interface.speak(intro)
+    
+    asyncio.run(_run_security_commands(interface, command_handler, prompts))
     
     return True
 
+async def _run_security_commands(interface, command_handler, prompts):
+    """Listen for the next command while the previous one is processed
+    
+    A producer speaks each prompt and listens; a consumer runs the heard
+    commands through the engine. Results are spoken before the next prompt
+    (never while the microphone is open), or at the end if still running.
+    """
+    heard: asyncio.Queue = asyncio.Queue(maxsize=4)
+    results: asyncio.Queue = asyncio.Queue()
+    
+    async def speak_results():
+        while not results.empty():
+            await asyncio.to_thread(interface.speak, results.get_nowait())
+    
+    async def producer():
+        for i, (expected_cmd, speak_prompt, listen_prompt) in enumerate(prompts, 1):
+            await speak_results()
+            print(f"\nTest {i}/4:")
+            await asyncio.to_thread(interface.speak, speak_prompt)
+            
+            result = await interface.alisten(timeout=15, prompt=listen_prompt)
+            await heard.put((expected_cmd, result))
+        await heard.put(None)
+    
+    async def consumer():
+        while (item := await heard.get()) is not None:
+            expected_cmd, result = item
+            if result:
+                print(f"You said: '{result}'")
+                
+                # Process the command
+                response = await asyncio.to_thread(command_handler, result)
+                await results.put(f"Command processed: {response[:50]}...")
+                
+                print(f"✅ Command '{expected_cmd}' test completed")
+            else:
+                print(f"❌ Failed to recognize '{expected_cmd}'")
+    
+    await asyncio.gather(producer(), consumer())
+    await speak_results()
+
 def interactive_voice_demo():
     """Interactive demo of voice conversation"""
     print("\n\nInteractive Voice Demo")
     print("=" * 40)
     
-    interface = create_enhanced_voice_interface()
-    engine = CommandEngine()
+    interface = get_interface()
+    engine = get_engine()
     
     def command_handler(command: str) -> str:
         return engine.process_voice_command(command, "CVE-2025-55182")
@@ -2,10 +2,89 @@
 
 import os
 import time
-from typing import Dict, Optional, Callable
-from elevenlabs import ElevenLabs
+import asyncio
+import hashlib
+import inspect
+import threading
+import weakref
+import httpx
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, List, Optional, Callable, Set, Tuple
 from loguru import logger
 
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    diskcache = None
+    DISKCACHE_AVAILABLE = False
+
+TTS_CACHE_TTL = 7 * 24 * 3600
+
+def _make_http_client(client_cls):
+    """Keep-alive (and HTTP/2 when h2 is installed) client for the ElevenLabs SDK
+    
+    One pooled connection per host is reused across calls instead of a TLS
+    handshake per request, and concurrent bulk calls multiplex over HTTP/2.
+    """
+    options = {
+        "limits": httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30),
+        "timeout": httpx.Timeout(60.0, connect=5.0),
+    }
+    try:
+        return client_cls(http2=True, **options)
+    except ImportError:
+        # HTTP/2 needs the optional h2 package
+        return client_cls(**options)
+
+class TTSCache:
+    """Content-addressed cache of synthesized call audio
+    
+    Alert scripts are templated, so the same (voice, script) pair is
+    synthesized over and over; caching the audio skips that round-trip.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, ttl: int = TTS_CACHE_TTL):
+        self.cache_dir = cache_dir or os.getenv("TTS_CACHE_DIR", os.path.join("cache", "tts"))
+        self.ttl = ttl
+        self._cache = diskcache.Cache(self.cache_dir) if DISKCACHE_AVAILABLE else None
+        if self._cache is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        
+    @staticmethod
+    def key(voice_id: str, script: str) -> str:
+        return hashlib.blake2b(voice_id.encode() + b"|" + script.encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[Tuple[float, bytes]]:
+        """Return (created_at, audio) for a live entry, or None"""
+        if self._cache is not None:
+            return self._cache.get(key)
+        
+        path = os.path.join(self.cache_dir, f"{key}.mp3")
+        try:
+            created_at = os.path.getmtime(path)
+            if time.time() - created_at > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, "rb") as f:
+                return created_at, f.read()
+        except OSError:
+            return None
+    
+    def set(self, key: str, audio: bytes) -> float:
+        created_at = time.time()
+        if self._cache is not None:
+            self._cache.set(key, (created_at, audio), expire=self.ttl)
+        else:
+            path = os.path.join(self.cache_dir, f"{key}.mp3")
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        return created_at
+
 class VoiceCaller:
     """Handles ElevenLabs voice call functionality"""
     
@@ -19,8 +98,149 @@ class VoiceCaller:
         if not self.voice_id:
             logger.warning("No voice ID provided, will use default")
             
-        self.client = ElevenLabs(api_key=self.api_key)
+        # Imported here so the mock caller never loads the SDK
+        from elevenlabs import ElevenLabs, AsyncElevenLabs
+        
+        self._async_client_cls = AsyncElevenLabs
+        self._http = _make_http_client(httpx.Client)
+        self.client = ElevenLabs(api_key=self.api_key, httpx_client=self._http)
+        # Pooled connections belong to the loop that opened them, so each
+        # event loop gets its own async client (see the aclient property)
+        self._aclients = weakref.WeakKeyDictionary()  # loop -> (http client, AsyncElevenLabs)
+        
+        # Probe once whether the SDK can end calls
+        # Note: Actual API method may differ
+        self._end_call_fn = getattr(getattr(self.client, "call", None), "end", None)
+        if self._end_call_fn is None:
+            logger.warning("ElevenLabs call.end() method not available")
+        
+        # ...and whether call.create takes pre-synthesized audio; without it
+        # the call does its own TTS and there is nothing to cache
+        create_fn = getattr(getattr(self.client, "call", None), "create", None)
+        try:
+            self._call_takes_audio = create_fn is not None and "audio" in inspect.signature(create_fn).parameters
+        except (TypeError, ValueError):
+            self._call_takes_audio = False
+        
+        # Insertion-ordered, so records are oldest first by start_ns
         self.active_calls = {}
+        # phone number -> IDs of its calls that are still active
+        self._by_phone: Dict[str, Set[str]] = defaultdict(set)
+        self.tts_cache = TTSCache()
+        # Scripts being synthesized into the cache in the background
+        self._tts_filling: Set[str] = set()
+        self._tts_lock = threading.Lock()
+        self._tts_pool = None
+    
+    @property
+    def aclient(self):
+        """Async ElevenLabs client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        cached = self._aclients.get(loop)
+        if cached is None or cached[0].is_closed:
+            http_client = _make_http_client(httpx.AsyncClient)
+            cached = (http_client, self._async_client_cls(api_key=self.api_key, httpx_client=http_client))
+            self._aclients[loop] = cached
+        return cached[1]
+    
+    async def aclose(self):
+        """Close the running loop's async HTTP pool
+        
+        Call before the loop that placed async calls finishes.
+        """
+        cached = self._aclients.pop(asyncio.get_running_loop(), None)
+        if cached is not None:
+            await cached[0].aclose()
+    
+    def _cached_call_audio(self, script: str) -> Tuple[Optional[bytes], Optional[float]]:
+        """Look up previously synthesized audio for a script
+        
+        Never synthesizes: a miss dials with the text straight away and
+        _fill_call_audio caches the audio for the next alert.
+        
+        Args:
+            script: Text to read via TTS
+            
+        Returns:
+            (audio bytes, timestamp of the cached audio), or (None, None) on a miss
+        """
+        if not self.voice_id or not self._call_takes_audio:
+            return None, None
+        
+        cached = self.tts_cache.get(TTSCache.key(self.voice_id, script))
+        if cached:
+            created_at, audio = cached
+            logger.info("Using cached call audio")
+            return audio, created_at
+        return None, None
+    
+    def _fill_call_audio(self, script: str):
+        """Synthesize a script into the cache on a background thread, once"""
+        if not self.voice_id or not self._call_takes_audio:
+            return
+        
+        key = TTSCache.key(self.voice_id, script)
+        with self._tts_lock:
+            if key in self._tts_filling:
+                return
+            self._tts_filling.add(key)
+            if self._tts_pool is None:
+                self._tts_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tts_fill")
+        
+        def synthesize():
+            try:
+                audio = b"".join(self.client.text_to_speech.convert(voice_id=self.voice_id, text=script))
+                self.tts_cache.set(key, audio)
+            except Exception as e:
+                logger.warning(f"Call audio synthesis failed: {e}")
+            finally:
+                with self._tts_lock:
+                    self._tts_filling.discard(key)
+        
+        self._tts_pool.submit(synthesize)
+    
+    def _call_request(self, phone_number: str, script: str, audio: Optional[bytes]) -> Dict:
+        """Build the call.create arguments
+        
+        Note: ElevenLabs calling API may vary based on their current implementation
+        This is based on the conceptual API described in the PRD
+        """
+        request = {
+            "to": phone_number,
+            "voice_id": self.voice_id,
+            "text": script,
+            "enable_commands": True,
+            "webhook_url": None  # Would need webhook for production
+        }
+        if audio is not None:
+            request["audio"] = audio  # Pre-synthesized script audio, skips TTS on the call
+        return request
+    
+    def _register_call(self, call, phone_number: str, command_callback: Optional[Callable],
+                       from_cache: Optional[float]) -> Optional[str]:
+        """Record a newly created call in active_calls
+        
+        Returns:
+            Call ID if the response carried one, None otherwise
+        """
+        call_id = getattr(call, 'call_id', getattr(call, 'id', None))
+        
+        if call_id:
+            self.active_calls[call_id] = {
+                "phone_number": phone_number,
+                "start_time": time.time(),
+                # Monotonic, for age checks that survive wall-clock steps
+                "start_ns": time.monotonic_ns(),
+                "callback": command_callback,
+                "status": "active",
+                "from_cache": from_cache
+            }
+            self._by_phone[phone_number].add(call_id)
+            logger.info(f"Call initiated with ID: {call_id}")
+            return call_id
+        else:
+            logger.error("Failed to get call ID from ElevenLabs response")
+            return None
     
     def place_call(self, phone_number: str, script: str, command_callback: Optional[Callable] = None) -> Optional[str]:
         """Place an outbound voice call
@@ -36,35 +256,51 @@ class VoiceCaller:
         try:
             logger.info(f"Placing voice call to {phone_number}")
             
-            # Note: ElevenLabs calling API may vary based on their current implementation
-            # This is based on the conceptual API described in the PRD
-            call = self.client.call.create(
-                to=phone_number,
-                voice_id=self.voice_id,
-                text=script,
-                enable_commands=True,
-                webhook_url=None  # Would need webhook for production
-            )
-            
-            call_id = getattr(call, 'call_id', getattr(call, 'id', None))
+            audio, from_cache = self._cached_call_audio(script)
+            call = self.client.call.create(**self._call_request(phone_number, script, audio))
+            if audio is None:
+                self._fill_call_audio(script)
+            return self._register_call(call, phone_number, command_callback, from_cache)
+                
+        except Exception as e:
+            logger.error(f"Failed to place call: {e}")
+            return None
+    
+    async def aplace_call(self, phone_number: str, script: str, command_callback: Optional[Callable] = None) -> Optional[str]:
+        """Async version of place_call"""
+        try:
+            logger.info(f"Placing voice call to {phone_number}")
             
-            if call_id:
-                self.active_calls[call_id] = {
-                    "phone_number": phone_number,
-                    "start_time": time.time(),
-                    "callback": command_callback,
-                    "status": "active"
-                }
-                logger.info(f"Call initiated with ID: {call_id}")
-                return call_id
-            else:
-                logger.error("Failed to get call ID from ElevenLabs response")
-                return None
+            audio, from_cache = self._cached_call_audio(script)
+            call = await self.aclient.call.create(**self._call_request(phone_number, script, audio))
+            if audio is None:
+                self._fill_call_audio(script)
+            return self._register_call(call, phone_number, command_callback, from_cache)
                 
         except Exception as e:
             logger.error(f"Failed to place call: {e}")
             return None
     
+    async def place_calls_bulk(self, targets: List[Tuple[str, str]],
+                               command_callback: Optional[Callable] = None) -> List[Optional[str]]:
+        """Place several calls concurrently, e.g. to everyone on call for an incident
+        
+        Args:
+            targets: (phone_number, script) pairs
+            command_callback: Function to handle voice commands on every call
+            
+        Returns:
+            Call IDs in target order, None for calls that failed
+        """
+        try:
+            return await asyncio.gather(*(
+                self.aplace_call(phone_number, script, command_callback)
+                for phone_number, script in targets
+            ))
+        finally:
+            # Close the pool on its own loop; asyncio.run() may end right after
+            await self.aclose()
+    
     def handle_voice_response(self, call_id: str, transcribed_text: str) -> str:
         """Process voice response from call recipient
         
@@ -109,13 +345,11 @@ class VoiceCaller:
                 # Update call status
                 self.active_calls[call_id]["status"] = "ended"
                 self.active_calls[call_id]["end_time"] = time.time()
+                self._unindex_call(call_id)
                 
-                # Attempt to end call via API if available
-                # Note: Actual API method may differ
-                try:
-                    self.client.call.end(call_id)
-                except AttributeError:
-                    logger.warning("ElevenLabs call.end() method not available")
+                # End call via API if available
+                if self._end_call_fn is not None:
+                    self._end_call_fn(call_id)
                 
                 logger.info(f"Call {call_id} ended")
                 return True
@@ -127,6 +361,26 @@ class VoiceCaller:
             logger.error(f"Error ending call: {e}")
             return False
     
+    def get_active_call_ids_for(self, phone_number: str) -> Set[str]:
+        """Get the active calls to a phone number, e.g. for an inbound webhook
+        
+        Args:
+            phone_number: Phone number the calls were placed to
+            
+        Returns:
+            Set of active call IDs (empty if none)
+        """
+        return set(self._by_phone.get(phone_number, ()))
+    
+    def _unindex_call(self, call_id: str):
+        """Drop a call from the phone number index"""
+        phone_number = self.active_calls[call_id]["phone_number"]
+        call_ids = self._by_phone.get(phone_number)
+        if call_ids is not None:
+            call_ids.discard(call_id)
+            if not call_ids:
+                del self._by_phone[phone_number]
+    
     def get_call_status(self, call_id: str) -> Optional[Dict]:
         """Get status of a call
         
@@ -144,16 +398,35 @@ class VoiceCaller:
         Args:
             max_age_seconds: Maximum age to keep call records
         """
-        current_time = time.time()
+        cutoff = time.monotonic_ns() - int(max_age_seconds * 1_000_000_000)
         to_remove = []
         
+        # Records are kept in start order, so stop at the first one still young
         for call_id, call_info in self.active_calls.items():
-            if current_time - call_info["start_time"] > max_age_seconds:
-                to_remove.append(call_id)
+            if call_info["start_ns"] >= cutoff:
+                break
+            to_remove.append(call_id)
         
         for call_id in to_remove:
-            del self.active_calls[call_id]
+            self._unindex_call(call_id)
             logger.info(f"Cleaned up old call record: {call_id}")
+        
+        if len(to_remove) > len(self.active_calls) // 2:
+            # Mostly expired: copying the survivors (the tail) beats deleting
+            self.active_calls = dict(islice(self.active_calls.items(), len(to_remove), None))
+        else:
+            for call_id in to_remove:
+                del self.active_calls[call_id]
+    
+    def close(self):
+        """Close the pooled HTTP connections"""
+        if self._tts_pool is not None:
+            self._tts_pool.shutdown(wait=False, cancel_futures=True)
+            self._tts_pool = None
+        self._http.close()
+        # Async pools are closed by aclose() on their own loop; one left open
+        # is dropped with its loop
+        self._aclients.clear()
 
 class MockVoiceCaller:
     """Mock implementation for testing without ElevenLabs API"""
@@ -177,6 +450,10 @@ class MockVoiceCaller:
         
         return call_id
     
+    async def place_calls_bulk(self, targets: List[Tuple[str, str]],
+                               command_callback: Optional[Callable] = None) -> List[Optional[str]]:
+        return [self.place_call(phone_number, script, command_callback) for phone_number, script in targets]
+    
     def handle_voice_response(self, call_id: str, transcribed_text: str) -> str:
         return f"[MOCK] Received: {transcribed_text}"
     
@@ -186,6 +463,9 @@ class MockVoiceCaller:
     
     def get_call_status(self, call_id: str) -> Dict:
         return {"status": "mock", "call_id": call_id}
+    
+    def close(self):
+        pass
 
 def create_voice_caller(use_mock: bool = False) -> VoiceCaller:
     """Factory function to create appropriate voice caller
@@ -202,16 +482,21 @@ def create_voice_caller(use_mock: bool = False) -> VoiceCaller:
         return VoiceCaller()
 
 if __name__ == "__main__":
+    from command_engine import build_keyword_matcher
+    
+    # Keyword -> (priority, response); the lowest priority present wins
+    COMMAND_RESPONSES = {
+        "patch": (0, "Patching initiated"),
+        "quarantine": (1, "Servers quarantined"),
+        "acknowledge": (2, "Incident acknowledged"),
+    }
+    
+    match_commands = build_keyword_matcher(COMMAND_RESPONSES)
+    
     # Test the voice caller
     def test_command_handler(command: str) -> str:
-        if "patch" in command:
-            return "Patching initiated"
-        elif "quarantine" in command:
-            return "Servers quarantined"
-        elif "acknowledge" in command:
-            return "Incident acknowledged"
-        else:
-            return "Unknown command"
+        matches = match_commands(command)
+        return min(matches)[1] if matches else "Unknown command"
     
     caller = create_voice_caller(use_mock=True)
     
@@ -224,5 +509,8 @@ if __name__ == "__main__":
     Say 'start patching' to begin remediation.
     """
     
-    call_id = caller.place_call("+1234567890", test_script, test_command_handler)
-    print(f"Call placed with ID: {call_id}")
\ No newline at end of file
+    call_ids = asyncio.run(caller.place_calls_bulk(
+        [("+1234567890", test_script), ("+1234567891", test_script)],
+        test_command_handler
+    ))
+    print(f"Calls placed with IDs: {call_ids}")
\ No newline at end of file
@@ -2,11 +2,21 @@
 
 import os
 import io
+import re
 import time
-import threading
 import json
-import requests
-from typing import Optional, Callable, Dict
+import queue
+import base64
+import asyncio
+import hashlib
+import platform
+import threading
+import importlib.util
+import httpx
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Callable, Dict, Iterator, AsyncIterator
 
 # Load environment variables from .env file
 try:
@@ -28,13 +38,120 @@ try:
 except ImportError:
     pygame = None
     PYGAME_AVAILABLE = False
-from elevenlabs import ElevenLabs, Voice
+
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except (ImportError, OSError):  # OSError: PortAudio library missing
+    sd = None
+    SOUNDDEVICE_AVAILABLE = False
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    websockets = None
+    WEBSOCKETS_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    from google.cloud import speech as google_speech
+    GOOGLE_SPEECH_AVAILABLE = True
+except ImportError:
+    google_speech = None
+    GOOGLE_SPEECH_AVAILABLE = False
+from elevenlabs import ElevenLabs
 from loguru import logger
 
+# Low-latency model for the streaming endpoint
+TTS_MODEL = "eleven_turbo_v2_5"
+
+# Raw 16-bit mono PCM, written to the sound card as chunks arrive
+PCM_SAMPLE_RATE = 24000
+
+# Constant-bitrate MP3 for pygame playback when sounddevice is missing
+MP3_FORMAT = "mp3_44100_128"
+MP3_BITRATE = 128_000
+MP3_SAMPLE_RATE = 44100
+
+# Fixed lines start_conversation is likely to say next, synthesized ahead
+CONVERSATION_PROMPTS = (
+    "What would you like to do?",
+    "I didn't hear you. Please speak clearly.",
+    "No response received. Ending conversation.",
+    "Thank you. Conversation ended.",
+)
+
+# Silero VAD turn detection: 32ms frames at 16kHz, end of turn after 700ms
+# of silence
+VAD_SAMPLE_RATE = 16000
+VAD_FRAME = 512
+VAD_SILENCE_MS = 700
+VAD_THRESHOLD = 0.5
+
+# Barge-in: this many consecutive confident speech frames (~100ms) during
+# playback cut the line short
+BARGE_IN_THRESHOLD = 0.6
+BARGE_IN_FRAMES = 3
+
+# Google streaming recognition: 100ms LINEAR16 chunks at 16kHz
+STT_SAMPLE_RATE = 16000
+STT_CHUNK = 1600
+STT_LANGUAGE = "en-US"
+
+# Saved ambient-noise calibration, reused across restarts for a day
+CALIBRATION_FILE = os.path.join(os.path.expanduser("~"), ".cache", "dasie", "mic_cal.json")
+CALIBRATION_MAX_AGE = 24 * 3600
+
+STREAM_INPUT_URL = (
+    "wss://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream-input"
+    "?model_id={model_id}&output_format=pcm_{sample_rate}"
+)
+
+def _json_dumps(obj) -> bytes:
+    """Compact JSON bytes, encoded with orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def _json_loads(data: bytes):
+    """Parse JSON bytes, with orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Agent simulation request body, encoded once around the only field that
+# changes per alert (the first message, spliced in where null is)
+SIMULATION_BODY_PREFIX, SIMULATION_BODY_SUFFIX = _json_dumps({
+    "simulation_specification": {
+        "simulated_user_config": {
+            "first_message": None,
+            "language": "en",
+            "disable_first_message_interruptions": False
+        }
+    },
+    "new_turns_limit": 10  # Limit conversation length
+}).split(b"null")
+
+# A command result containing either word ends the conversation
+COMPLETION_RE = re.compile(r"\b(?:completed|acknowledged)\b", re.IGNORECASE)
+
+# Command keywords looked for in agent conversation turns. Anchored at the
+# start of a word only, so "patching" counts but "dispatch" does not
+COMMAND_KEYWORDS = ("patch", "quarantine", "isolate", "acknowledge", "shutdown", "status")
+COMMAND_RE = re.compile(r"\b(" + "|".join(COMMAND_KEYWORDS) + ")", re.IGNORECASE)
+
 class VoiceInterface:
     """Microphone-based voice interface using ElevenLabs TTS and local STT"""
     
-    def __init__(self, api_key: Optional[str] = None, voice_id: Optional[str] = None, agent_id: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, voice_id: Optional[str] = None, agent_id: Optional[str] = None,
+                 force_recalibrate: bool = False, barge_in: Optional[bool] = None):
         self.api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
         self.voice_id = voice_id or os.getenv("VOICE_ID", "21m00Tcm4TlvDq8ikWAM")  # Default voice
         self.agent_id = agent_id or os.getenv("ELEVENLABS_AGENT_ID")  # For conversation simulation
@@ -42,7 +159,14 @@ class VoiceInterface:
         if not self.api_key:
             raise ValueError("ElevenLabs API key not provided")
         
-        self.client = ElevenLabs(api_key=self.api_key)
+        # One pooled keep-alive client for the SDK and the REST calls below,
+        # so each alert skips the TCP/TLS handshake
+        try:
+            self._http = httpx.Client(http2=True, timeout=httpx.Timeout(30.0, connect=5.0))
+        except ImportError:
+            # HTTP/2 needs the optional h2 package
+            self._http = httpx.Client(timeout=httpx.Timeout(30.0, connect=5.0))
+        self.client = ElevenLabs(api_key=self.api_key, httpx_client=self._http)
         
         # Initialize speech recognition if available
         if SPEECH_RECOGNITION_AVAILABLE:
@@ -52,12 +176,64 @@ class VoiceInterface:
             self.recognizer = None
             self.microphone = None
         
+        # Google Cloud streaming recognition transcribes while the engineer
+        # is still speaking, instead of uploading the phrase afterwards
+        self._speech_client = None
+        if GOOGLE_SPEECH_AVAILABLE and SOUNDDEVICE_AVAILABLE:
+            try:
+                self._speech_client = google_speech.SpeechClient()
+            except Exception as e:
+                logger.warning(f"Google streaming speech unavailable, using recognize_google: {e}")
+        
+        # Silero VAD ends a turn as soon as the speaker stops, instead of the
+        # energy threshold's fixed pause and phrase limits
+        self._vad = None
+        if SOUNDDEVICE_AVAILABLE and importlib.util.find_spec("silero_vad") is not None:
+            try:
+                from silero_vad import load_silero_vad
+                self._vad = load_silero_vad()
+            except Exception as e:
+                logger.warning(f"Failed to load Silero VAD: {e}")
+        
         # Initialize pygame for audio playback if available
         if PYGAME_AVAILABLE:
-            pygame.mixer.init()
+            # Open the mixer at the MP3's own rate so decoded audio is not
+            # resampled; a later instance reuses the already open mixer
+            if not pygame.mixer.get_init():
+                pygame.mixer.pre_init(frequency=MP3_SAMPLE_RATE, size=-16, channels=1, buffer=512)
+                pygame.mixer.init()
         else:
             logger.warning("Pygame not available, audio playback disabled")
         
+        # Set by stop_conversation() to cut off streaming playback
+        self._stop_playback = threading.Event()
+        
+        # Barge-in listens to the microphone during playback, so over open
+        # speakers without echo cancellation the alert would hear itself and
+        # cut out. Only enable it with a headset or an AEC-equipped device.
+        if barge_in is None:
+            barge_in = os.getenv("BARGE_IN", "false").lower() == "true"
+        self.barge_in = barge_in and self._vad is not None
+        
+        # Set when the engineer talks over an interruptible line; the audio
+        # heard so far seeds the next capture
+        self._interrupt = threading.Event()
+        self._barge_in_frames = []
+        
+        # Output stream and microphone kept open for the length of a
+        # conversation
+        self._output_stream = None
+        self._mic_source = None
+        
+        # Synthesized audio for repeated prompts, replayed without the API
+        self._tts_cache_dir = os.path.join(os.getenv("TTS_CACHE_DIR", os.path.join("cache", "tts")), "stream")
+        os.makedirs(self._tts_cache_dir, exist_ok=True)
+        self._speech_format = f"pcm_{PCM_SAMPLE_RATE}" if SOUNDDEVICE_AVAILABLE else MP3_FORMAT
+        
+        # text -> Future of a background synthesis into the cache
+        self._prefetch: Dict[str, Future] = {}
+        self._prefetch_pool = None
+        
         # Conversation state
         self.conversation_active = False
         self.listening = False
@@ -65,50 +241,113 @@ class VoiceInterface:
         self.conversation_history = []
         
         # Calibrate microphone
-        self._calibrate_microphone()
+        self._calibrate_microphone(force=force_recalibrate)
         
         logger.info("Voice interface initialized")
     
-    def _calibrate_microphone(self):
-        """Calibrate microphone for ambient noise"""
+    def _calibrate_microphone(self, force: bool = False):
+        """Calibrate microphone for ambient noise
+        
+        Reuses the threshold saved by an earlier run on this host when it is
+        less than a day old, skipping the 1s ambient sample.
+        
+        Args:
+            force: Recalibrate even if a saved calibration is valid
+        """
+        if self._vad is not None:
+            return  # Silero VAD does not use the energy threshold
+        
+        if not force and self._load_calibration():
+            logger.info(f"Using saved microphone calibration (threshold {self.recognizer.energy_threshold:.0f})")
+            return
+        
         try:
             logger.info("Calibrating microphone for ambient noise...")
             with self.microphone as source:
                 self.recognizer.adjust_for_ambient_noise(source, duration=1)
             logger.info("Microphone calibrated successfully")
+            self._save_calibration()
         except Exception as e:
             logger.warning(f"Failed to calibrate microphone: {e}")
     
-    def speak(self, text: str) -> bool:
+    def _load_calibration(self) -> bool:
+        """Apply the saved calibration if it is recent and from this host"""
+        try:
+            with open(CALIBRATION_FILE) as f:
+                saved = json.load(f)
+            if saved["host"] != platform.node() or time.time() - saved["ts"] > CALIBRATION_MAX_AGE:
+                return False
+            self.recognizer.energy_threshold = saved["energy_threshold"]
+            self.recognizer.dynamic_energy_threshold = saved["dynamic_energy_threshold"]
+            return True
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+    
+    def _save_calibration(self):
+        try:
+            os.makedirs(os.path.dirname(CALIBRATION_FILE), exist_ok=True)
+            with open(CALIBRATION_FILE, "w") as f:
+                json.dump({
+                    "energy_threshold": self.recognizer.energy_threshold,
+                    "dynamic_energy_threshold": self.recognizer.dynamic_energy_threshold,
+                    "ts": time.time(),
+                    "host": platform.node()
+                }, f)
+        except OSError as e:
+            logger.debug(f"Could not save microphone calibration: {e}")
+    
+    def speak(self, text: str, interruptible: bool = False) -> bool:
         """Convert text to speech and play it
         
         Args:
             text: Text to speak
+            interruptible: Stop as soon as the engineer starts talking
+                (needs barge_in; check _interrupt afterwards)
             
         Returns:
             True if successful
         """
+        watcher = None
         try:
             logger.info(f"Speaking: {text[:50]}...")
             
-            # Generate audio using ElevenLabs
-            audio_generator = self.client.generate(
-                text=text,
-                voice=Voice(voice_id=self.voice_id),
-                model="eleven_monolingual_v1"
-            )
+            self._stop_playback.clear()
+            self._interrupt.clear()
+            self._barge_in_frames = []
             
-            # Convert generator to bytes
-            audio_data = b"".join(audio_generator)
+            if interruptible and self.barge_in:
+                watcher_done = threading.Event()
+                watcher = threading.Thread(target=self._watch_for_barge_in, args=(watcher_done,), daemon=True)
+                watcher.start()
             
-            # Play audio using pygame
-            audio_io = io.BytesIO(audio_data)
-            pygame.mixer.music.load(audio_io)
-            pygame.mixer.music.play()
+            # Let a background synthesis of this text finish, then play it
+            # from the cache
+            pending = self._prefetch.pop(text, None)
+            if pending is not None:
+                try:
+                    pending.result()
+                except Exception as e:
+                    logger.debug(f"Speech prefetch failed, synthesizing now: {e}")
             
-            # Wait for audio to finish
-            while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
+            if SOUNDDEVICE_AVAILABLE:
+                # Play chunks as they arrive instead of after full synthesis
+                self._play_pcm_stream(self._cached_tts_stream(text, self._speech_format))
+            else:
+                audio_data = b"".join(self._cached_tts_stream(text, self._speech_format))
+                
+                # Play audio using pygame
+                audio_io = io.BytesIO(audio_data)
+                pygame.mixer.music.load(audio_io)
+                pygame.mixer.music.play()
+                
+                # Constant bitrate gives the clip length up front: block for
+                # it (stop_conversation() wakes us early), then catch the
+                # last few milliseconds of decoder lag
+                self._stop_playback.wait(len(audio_data) * 8 / MP3_BITRATE)
+                while pygame.mixer.music.get_busy() and not self._stop_playback.is_set():
+                    time.sleep(0.01)
+                if self._stop_playback.is_set():
+                    pygame.mixer.music.stop()
             
             logger.info("Speech playback completed")
             return True
@@ -116,6 +355,226 @@ class VoiceInterface:
         except Exception as e:
             logger.error(f"Failed to speak text: {e}")
             return False
+        finally:
+            if watcher is not None:
+                watcher_done.set()
+                watcher.join()
+    
+    def _watch_for_barge_in(self, done: threading.Event):
+        """Interrupt playback when the engineer starts talking over it
+        
+        Runs on its own thread during an interruptible speak() until done is
+        set. BARGE_IN_FRAMES consecutive frames above BARGE_IN_THRESHOLD stop
+        playback and set _interrupt.
+        
+        Args:
+            done: Set by speak() once playback has finished
+        """
+        frame_ms = VAD_FRAME * 1000 // VAD_SAMPLE_RATE
+        frames = queue.Queue()
+        
+        def on_audio(indata, frame_count, time_info, status):
+            frames.put(bytes(indata))
+        
+        self._vad.reset_states()
+        recent = deque(maxlen=300 // frame_ms)
+        run = 0
+        
+        try:
+            with sd.RawInputStream(samplerate=VAD_SAMPLE_RATE, blocksize=VAD_FRAME,
+                                   dtype="int16", channels=1, callback=on_audio):
+                while not done.is_set():
+                    try:
+                        frame = frames.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    
+                    recent.append(frame)
+                    run = run + 1 if self._speech_probability(frame) > BARGE_IN_THRESHOLD else 0
+                    if run >= BARGE_IN_FRAMES:
+                        logger.info("Engineer started speaking, stopping playback")
+                        self._barge_in_frames = list(recent)
+                        self._interrupt.set()
+                        self._stop_playback.set()
+                        return
+        except Exception as e:
+            logger.debug(f"Barge-in detection unavailable: {e}")
+    
+    def _speech_probability(self, frame: bytes) -> float:
+        """Silero VAD speech probability for one VAD_FRAME of int16 audio"""
+        import numpy as np
+        import torch
+        
+        samples = torch.from_numpy(np.frombuffer(frame, dtype=np.int16).astype(np.float32) / 32768.0)
+        return self._vad(samples, VAD_SAMPLE_RATE).item()
+    
+    async def speak_stream(self, text_iter: AsyncIterator[str]) -> bool:
+        """Speak text while it is still being produced (e.g. by an LLM)
+        
+        Fragments are pushed over one ElevenLabs stream-input WebSocket as
+        they arrive and the returned audio is played as it comes back, so
+        speech starts long before the full text exists.
+        
+        Args:
+            text_iter: Async iterator of text fragments
+            
+        Returns:
+            True if successful
+        """
+        if not (WEBSOCKETS_AVAILABLE and SOUNDDEVICE_AVAILABLE):
+            text = "".join([fragment async for fragment in text_iter])
+            return await asyncio.to_thread(self.speak, text)
+        
+        from llm_summarizer import SentenceBuffer
+        
+        self._stop_playback.clear()
+        
+        # Playback blocks on the sound card, so it gets its own thread
+        audio_q: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        player = threading.Thread(target=self._play_pcm_stream, args=(iter(audio_q.get, None),), daemon=True)
+        player.start()
+        
+        url = STREAM_INPUT_URL.format(voice_id=self.voice_id, model_id=TTS_MODEL, sample_rate=PCM_SAMPLE_RATE)
+        try:
+            async with websockets.connect(url) as ws:
+                # Beginning of stream: authentication and voice settings
+                await ws.send(json.dumps({
+                    "text": " ",
+                    "voice_settings": {"stability": 0.5, "similarity_boost": 0.8},
+                    "xi_api_key": self.api_key
+                }))
+                
+                async def send_text():
+                    # Send whole sentences so each generation is prosodically
+                    # self-contained rather than cut at token boundaries
+                    sentences = SentenceBuffer()
+                    async for fragment in text_iter:
+                        for sentence in sentences.feed(fragment):
+                            await ws.send(json.dumps({"text": sentence + " ", "try_trigger_generation": True}))
+                    rest = sentences.flush()
+                    if rest:
+                        await ws.send(json.dumps({"text": rest + " ", "try_trigger_generation": True}))
+                    # End of stream: flush whatever is buffered
+                    await ws.send(json.dumps({"text": ""}))
+                
+                async def receive_audio():
+                    async for message in ws:
+                        data = json.loads(message)
+                        if data.get("audio"):
+                            audio_q.put(base64.b64decode(data["audio"]))
+                        if data.get("isFinal"):
+                            break
+                
+                await asyncio.gather(send_text(), receive_audio())
+            return True
+        except Exception as e:
+            logger.error(f"Failed to stream speech: {e}")
+            return False
+        finally:
+            audio_q.put(None)
+            await asyncio.to_thread(player.join)
+    
+    def _tts_stream(self, text: str, output_format: str) -> Iterator[bytes]:
+        """Audio chunks from the ElevenLabs streaming endpoint"""
+        return self.client.text_to_speech.stream(
+            voice_id=self.voice_id,
+            text=text,
+            model_id=TTS_MODEL,
+            output_format=output_format
+        )
+    
+    def _tts_cache_path(self, text: str, output_format: str) -> str:
+        """Cache file for one voice/model/format/text combination"""
+        digest = hashlib.sha256(f"{self.voice_id}|{TTS_MODEL}|{output_format}|{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self._tts_cache_dir, f"{digest}.{output_format.split('_')[0]}")
+    
+    def _cached_tts_stream(self, text: str, output_format: str) -> Iterator[bytes]:
+        """Like _tts_stream, but replays cached audio and caches new audio
+        
+        New audio is written to a scratch file while it streams out and only
+        renamed into place once complete, so an interrupted playback never
+        leaves a truncated entry.
+        """
+        path = self._tts_cache_path(text, output_format)
+        try:
+            with open(path, "rb") as f:
+                logger.debug("Playing cached speech")
+                yield from iter(lambda: f.read(65536), b"")
+            return
+        except FileNotFoundError:
+            pass
+        
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            with open(partial, "wb") as f:
+                for chunk in self._tts_stream(text, output_format):
+                    f.write(chunk)
+                    yield chunk
+            os.replace(partial, path)
+        except BaseException:
+            # Includes GeneratorExit when playback is stopped early
+            try:
+                os.remove(partial)
+            except OSError:
+                pass
+            raise
+    
+    def prefetch_speech(self, texts):
+        """Synthesize upcoming lines into the cache in the background
+        
+        Args:
+            texts: Lines likely to be spoken soon
+        """
+        if self._prefetch_pool is None:
+            self._prefetch_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="tts_prefetch")
+        
+        for text in texts:
+            if text in self._prefetch or os.path.exists(self._tts_cache_path(text, self._speech_format)):
+                continue
+            self._prefetch[text] = self._prefetch_pool.submit(self._synthesize_to_cache, text)
+    
+    def _synthesize_to_cache(self, text: str):
+        for _ in self._cached_tts_stream(text, self._speech_format):
+            pass
+    
+    def _play_pcm_stream(self, chunks: Iterator[bytes]):
+        """Write PCM chunks to the output device as they arrive
+        
+        Returns once the device has drained the last chunk or
+        stop_conversation() was called.
+        """
+        stream = self._output_stream
+        if stream is None:
+            # Closing the stream waits for the last chunk to play
+            with sd.RawOutputStream(samplerate=PCM_SAMPLE_RATE, channels=1, dtype="int16") as stream:
+                self._write_pcm(stream, chunks)
+            return
+        
+        # The conversation's stream stays open, so wait out its buffer instead
+        if not stream.active:
+            stream.start()
+        if self._write_pcm(stream, chunks):
+            self._stop_playback.wait(stream.latency)
+    
+    def _write_pcm(self, stream, chunks: Iterator[bytes]) -> bool:
+        """Write PCM chunks to an open stream, aborting it on stop
+        
+        Returns:
+            True if every chunk was written
+        """
+        pending = b""
+        for chunk in chunks:
+            if self._stop_playback.is_set():
+                stream.abort()
+                return False
+            
+            # Only whole 2-byte samples can be written
+            pending += chunk
+            usable = len(pending) & ~1
+            if usable:
+                stream.write(pending[:usable])
+                pending = pending[usable:]
+        return True
     
     def listen(self, timeout: int = 5, phrase_timeout: int = 2) -> Optional[str]:
         """Listen for speech input from microphone
@@ -130,13 +589,28 @@ class VoiceInterface:
         try:
             logger.info("Listening for speech...")
             
-            with self.microphone as source:
-                # Listen for audio
-                audio = self.recognizer.listen(
-                    source, 
-                    timeout=timeout, 
-                    phrase_time_limit=phrase_timeout
-                )
+            if self._speech_client is not None:
+                text = self._stream_recognize(timeout, phrase_timeout)
+                if text is None:
+                    raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                
+                logger.info(f"Recognized: '{text}'")
+                return text.lower().strip()
+            
+            if self._vad is not None:
+                audio = self._capture_utterance(timeout, phrase_timeout)
+                if audio is None:
+                    raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+            else:
+                # Inside a conversation the microphone is already open
+                mic = nullcontext(self._mic_source) if self._mic_source is not None else self.microphone
+                with mic as source:
+                    # Listen for audio
+                    audio = self.recognizer.listen(
+                        source, 
+                        timeout=timeout, 
+                        phrase_time_limit=phrase_timeout
+                    )
             
             logger.info("Processing speech...")
             
@@ -159,6 +633,118 @@ class VoiceInterface:
             logger.error(f"Unexpected error during speech recognition: {e}")
             return None
     
+    def _stream_recognize(self, timeout: float, phrase_timeout: float) -> Optional[str]:
+        """Transcribe one utterance with Google Cloud streaming recognition
+        
+        Microphone chunks are sent as they are recorded and the first final
+        result is returned, so the transcript arrives shortly after the
+        engineer stops speaking.
+        
+        Args:
+            timeout: Maximum time to wait for speech to start
+            phrase_timeout: Maximum length of the utterance
+            
+        Returns:
+            Final transcript, or None if nothing was recognized
+        """
+        chunks = queue.Queue()
+        done = threading.Event()
+        deadline = time.monotonic() + timeout + phrase_timeout
+        
+        def on_audio(indata, frame_count, time_info, status):
+            chunks.put(bytes(indata))
+        
+        def requests_iter():
+            while not done.is_set() and time.monotonic() < deadline:
+                try:
+                    chunk = chunks.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                yield google_speech.StreamingRecognizeRequest(audio_content=chunk)
+        
+        streaming_config = google_speech.StreamingRecognitionConfig(
+            config=google_speech.RecognitionConfig(
+                encoding=google_speech.RecognitionConfig.AudioEncoding.LINEAR16,
+                sample_rate_hertz=STT_SAMPLE_RATE,
+                language_code=STT_LANGUAGE
+            ),
+            interim_results=True,
+            single_utterance=True
+        )
+        end_of_utterance = google_speech.StreamingRecognizeResponse.SpeechEventType.END_OF_SINGLE_UTTERANCE
+        
+        with sd.RawInputStream(samplerate=STT_SAMPLE_RATE, blocksize=STT_CHUNK,
+                               dtype="int16", channels=1, callback=on_audio):
+            try:
+                responses = self._speech_client.streaming_recognize(config=streaming_config, requests=requests_iter())
+                for response in responses:
+                    if response.speech_event_type == end_of_utterance:
+                        # Stop sending audio; the final result follows
+                        done.set()
+                    for result in response.results:
+                        if result.is_final and result.alternatives:
+                            return result.alternatives[0].transcript
+            finally:
+                done.set()
+        
+        return None
+    
+    def _capture_utterance(self, timeout: float, phrase_timeout: float):
+        """Record one utterance, ending the turn with Silero VAD
+        
+        IDLE until a frame's speech probability crosses VAD_THRESHOLD, then
+        LISTENING until VAD_SILENCE_MS of silence (or phrase_timeout of
+        speech) has passed.
+        
+        Args:
+            timeout: Maximum time to wait for speech to start
+            phrase_timeout: Maximum length of the utterance
+            
+        Returns:
+            sr.AudioData of the utterance, or None if nobody spoke
+        """
+        frame_ms = VAD_FRAME * 1000 // VAD_SAMPLE_RATE
+        frames = queue.Queue()
+        
+        def on_audio(indata, frame_count, time_info, status):
+            frames.put(bytes(indata))
+        
+        self._vad.reset_states()
+        # Keep the first syllable, or what was said over the last line
+        preroll = deque(self._barge_in_frames, maxlen=300 // frame_ms)
+        self._barge_in_frames = []
+        speech = []
+        silence_ms = 0
+        deadline = time.monotonic() + timeout
+        
+        with sd.RawInputStream(samplerate=VAD_SAMPLE_RATE, blocksize=VAD_FRAME,
+                               dtype="int16", channels=1, callback=on_audio):
+            while True:
+                try:
+                    frame = frames.get(timeout=0.1)
+                except queue.Empty:
+                    frame = None
+                
+                if frame is not None:
+                    is_speech = self._speech_probability(frame) > VAD_THRESHOLD
+                    
+                    if speech:
+                        speech.append(frame)
+                        silence_ms = 0 if is_speech else silence_ms + frame_ms
+                        if silence_ms >= VAD_SILENCE_MS or time.monotonic() >= deadline:
+                            break
+                    elif is_speech:
+                        speech.extend(preroll)
+                        speech.append(frame)
+                        deadline = time.monotonic() + phrase_timeout
+                    else:
+                        preroll.append(frame)
+                
+                if not speech and time.monotonic() >= deadline:
+                    return None
+        
+        return sr.AudioData(b"".join(speech), VAD_SAMPLE_RATE, 2)
+    
     def simulate_conversation_with_agent(self, initial_message: str, command_callback: Callable[[str], str]) -> str:
         """Use ElevenLabs agent for conversation simulation
         
@@ -177,16 +763,7 @@ class VoiceInterface:
             logger.info("Starting ElevenLabs agent conversation simulation")
             
             # Prepare simulation request
-            simulation_data = {
-                "simulation_specification": {
-                    "simulated_user_config": {
-                        "first_message": initial_message,
-                        "language": "en",
-                        "disable_first_message_interruptions": False
-                    }
-                },
-                "new_turns_limit": 10  # Limit conversation length
-            }
+            body = SIMULATION_BODY_PREFIX + _json_dumps(initial_message) + SIMULATION_BODY_SUFFIX
             
             # Make API request to ElevenLabs
             headers = {
@@ -196,10 +773,11 @@ class VoiceInterface:
             
             url = f"https://api.elevenlabs.io/v1/convai/agents/{self.agent_id}/simulate-conversation"
             
-            response = requests.post(url, headers=headers, json=simulation_data)
+            # Pre-encoded bytes, so httpx does not serialize again
+            response = self._http.post(url, headers=headers, content=body)
             
             if response.status_code == 200:
-                result = response.json()
+                result = _json_loads(response.content)
                 
                 # Process the conversation
                 conversation_turns = result.get("simulated_conversation", [])
@@ -239,17 +817,14 @@ class VoiceInterface:
                 logger.info(f"User said: {content}")
                 
                 # Look for command keywords in the conversation
-                command_keywords = ["patch", "quarantine", "isolate", "acknowledge", "shutdown", "status"]
-                
-                for keyword in command_keywords:
-                    if keyword in content.lower():
-                        logger.info(f"Detected command keyword: {keyword}")
-                        try:
-                            response = command_callback(content.lower())
-                            logger.info(f"Command executed: {response}")
-                        except Exception as e:
-                            logger.error(f"Error executing command: {e}")
-                        break
+                match = COMMAND_RE.search(content)
+                if match:
+                    logger.info(f"Detected command keyword: {match.group(1).lower()}")
+                    try:
+                        response = command_callback(content.lower())
+                        logger.info(f"Command executed: {response}")
+                    except Exception as e:
+                        logger.error(f"Error executing command: {e}")
     
     def start_conversation(self, initial_message: str, command_callback: Callable[[str], str]) -> str:
         """Start an interactive voice conversation
@@ -271,7 +846,22 @@ class VoiceInterface:
         logger.info("Starting voice conversation")
         
         try:
-            # Speak initial message
+            if SOUNDDEVICE_AVAILABLE:
+                # Every line of the conversation plays through one stream
+                self._output_stream = sd.RawOutputStream(samplerate=PCM_SAMPLE_RATE, channels=1, dtype="int16")
+                self._output_stream.start()
+            
+            if self.microphone is not None and self._vad is None and self._speech_client is None:
+                # recognize_google path: open the input device once, not on
+                # every listen()
+                self._mic_source = self.microphone.__enter__()
+            
+            # The follow-up lines are synthesized while the alert plays and
+            # while we listen, so they start without TTS latency
+            self.prefetch_speech(CONVERSATION_PROMPTS)
+            
+            # Speak initial message in full; only the prompts after it can be
+            # talked over
             if not self.speak(initial_message):
                 return "Failed to start conversation - audio error"
             
@@ -280,7 +870,10 @@ class VoiceInterface:
             max_attempts = 3
             
             while self.conversation_active and attempts < max_attempts:
-                self.speak("What would you like to do?")
+                # An engineer who talked over the last line is already
+                # answering, so go straight to listening
+                if not self._interrupt.is_set():
+                    self.speak("What would you like to do?", interruptible=True)
                 
                 # Listen for response
                 response = self.listen(timeout=10, phrase_timeout=3)
@@ -288,7 +881,7 @@ class VoiceInterface:
                 if response is None:
                     attempts += 1
                     if attempts < max_attempts:
-                        self.speak("I didn't hear you. Please speak clearly.")
+                        self.speak("I didn't hear you. Please speak clearly.", interruptible=True)
                     else:
                         self.speak("No response received. Ending conversation.")
                         break
@@ -300,7 +893,7 @@ class VoiceInterface:
                     self.speak(result)
                     
                     # Check if conversation should continue
-                    if "completed" in result.lower() or "acknowledged" in result.lower():
+                    if COMPLETION_RE.search(result) is not None:
                         self.speak("Thank you. Conversation ended.")
                         break
                 else:
@@ -321,6 +914,12 @@ class VoiceInterface:
             return f"Error: {e}"
         finally:
             self.conversation_active = False
+            if self._output_stream is not None:
+                self._output_stream.close()
+                self._output_stream = None
+            if self._mic_source is not None:
+                self.microphone.__exit__(None, None, None)
+                self._mic_source = None
     
     def quick_alert(self, message: str, wait_for_response: bool = True) -> Optional[str]:
         """Send a quick voice alert and optionally wait for response
@@ -355,11 +954,19 @@ class VoiceInterface:
         self.conversation_active = False
         
         # Stop any playing audio
+        self._stop_playback.set()
         try:
             pygame.mixer.music.stop()
         except:
             pass
     
+    def close(self):
+        """Release the HTTP connection pool and prefetch workers"""
+        if self._prefetch_pool is not None:
+            self._prefetch_pool.shutdown(wait=False, cancel_futures=True)
+            self._prefetch_pool = None
+        self._http.close()
+    
     def test_audio_system(self) -> bool:
         """Test the audio input/output system
         
@@ -403,6 +1010,9 @@ class MockVoiceInterface:
         print(f"\n🔊 SYSTEM SPEAKING: {text}\n")
         return True
     
+    async def speak_stream(self, text_iter: AsyncIterator[str]) -> bool:
+        return self.speak("".join([fragment async for fragment in text_iter]))
+    
     def listen(self, timeout: int = 5, phrase_timeout: int = 2) -> Optional[str]:
         print("🎤 Listening for your response...")
         response = input("Enter your voice command: ").strip()
@@ -429,7 +1039,7 @@ class MockVoiceInterface:
             result = command_callback(response)
             self.speak(result)
             
-            if "completed" in result.lower() or "acknowledged" in result.lower():
+            if COMPLETION_RE.search(result) is not None:
                 break
         
         print("="*50)
@@ -450,15 +1060,19 @@ class MockVoiceInterface:
     def stop_conversation(self):
         self.conversation_active = False
     
+    def close(self):
+        pass
+    
     def test_audio_system(self) -> bool:
         self.speak("Mock audio system test - always passes")
         return True
 
-def create_voice_interface(use_mock: bool = False) -> VoiceInterface:
+def create_voice_interface(use_mock: bool = False, force_recalibrate: bool = False) -> VoiceInterface:
     """Factory function to create appropriate voice interface
     
     Args:
         use_mock: Whether to use mock implementation
+        force_recalibrate: Ignore any saved microphone calibration
         
     Returns:
         Voice interface instance
@@ -468,7 +1082,7 @@ def create_voice_interface(use_mock: bool = False) -> VoiceInterface:
     
     # Try ElevenLabs voice interface first (if configured)
     try:
-        interface = VoiceInterface()
+        interface = VoiceInterface(force_recalibrate=force_recalibrate)
         if interface.agent_id:
             logger.info("Using ElevenLabs voice interface with agent")
             return interface
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
 import os
+import sys
 import time
+import asyncio
 import signal
 import threading
 from typing import Optional, Dict
@@ -14,14 +16,28 @@ from voice_caller import VoiceCaller, create_voice_caller
 from voice_interface import VoiceInterface, create_voice_interface
 from command_engine import CommandEngine
 
+# CVE IDs remembered for deduplication across scans (oldest forgotten first)
+SEEN_CVES_MAX = 10_000
+
+# LLM summaries generated ahead of the alert worker at once
+SUMMARY_CONCURRENCY = 4
+
 class VoiceAlertSystem:
     """Main orchestration system for Zero-Day VoiceAlert"""
     
-    def __init__(self, config_file: str = ".env"):
+    def __init__(self, config_file: str = ".env", force_recalibrate: bool = False):
         # Load environment configuration
         load_dotenv(config_file)
         
         self.running = False
+        self._shutdown: Optional[asyncio.Event] = None
+        # Wakes blocking waits on worker threads (call monitoring) on stop()
+        self._wake = threading.Event()
+        # Daemon thread running the current voice alert; guarded by _voice_lock
+        self._voice_thread: Optional[threading.Thread] = None
+        self._voice_lock = threading.Lock()
+        # CVE IDs already queued, in the order they were first seen
+        self._seen_cves: Dict[str, None] = {}
         self.poll_interval = int(os.getenv("POLL_INTERVAL_MINUTES", 5)) * 60
         self.engineer_phone = os.getenv("ENGINEER_PHONE_NUMBER")
         self.use_mock_voice = os.getenv("USE_MOCK_VOICE", "false").lower() == "true"
@@ -34,7 +50,10 @@ class VoiceAlertSystem:
         
         # Initialize voice interface (microphone or phone)
         if self.use_microphone:
-            self.voice_interface = create_voice_interface(use_mock=self.use_mock_voice)
+            self.voice_interface = create_voice_interface(
+                use_mock=self.use_mock_voice,
+                force_recalibrate=force_recalibrate
+            )
             logger.info("Using microphone-based voice interface")
         else:
             self.voice_caller = create_voice_caller(use_mock=self.use_mock_voice)
@@ -43,16 +62,13 @@ class VoiceAlertSystem:
         # Setup logging
         log_level = os.getenv("LOG_LEVEL", "INFO")
         logger.remove()
-        logger.add("logs/voicealert_{time:YYYY-MM-DD}.log", level=log_level, rotation="1 day")
-        logger.add(lambda msg: print(msg, end=""), level=log_level)
+        # enqueue: sinks are written from loguru's worker thread, not the caller
+        logger.add("logs/voicealert_{time:YYYY-MM-DD}.log", level=log_level, rotation="1 day", enqueue=True)
+        logger.add(sys.stdout, level=log_level, enqueue=True, backtrace=False, diagnose=False)
         
         # Validate configuration
         self._validate_config()
         
-        # Setup signal handlers
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
-        
         logger.info("VoiceAlert System initialized")
     
     def _validate_config(self):
@@ -76,9 +92,10 @@ class VoiceAlertSystem:
             logger.info(f"Voice mode: Phone calls to {self.engineer_phone}")
         
         self.running = True
+        self._wake.clear()
         
         try:
-            self._main_loop()
+            asyncio.run(self._main_loop())
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt")
         except Exception as e:
@@ -89,37 +106,202 @@ class VoiceAlertSystem:
     def stop(self):
         """Stop the monitoring system"""
         logger.info("Stopping VoiceAlert System")
-        self.running = False
+        with self._voice_lock:
+            self.running = False
+            alert_in_progress = self._voice_thread is not None
+        self._wake.set()
+        if self._shutdown is not None:
+            self._shutdown.set()
+        
+        if alert_in_progress:
+            # The voice thread closes the clients once the conversation returns
+            if hasattr(self, 'voice_interface') and hasattr(self.voice_interface, 'stop_conversation'):
+                self.voice_interface.stop_conversation()
+        else:
+            self._close_clients()
+    
+    def _close_clients(self):
+        """Release the voice clients and save the command engine's state"""
+        if hasattr(self, 'voice_caller'):
+            self.voice_caller.close()
+        if hasattr(self, 'voice_interface') and hasattr(self.voice_interface, 'close'):
+            self.voice_interface.close()
+        if hasattr(self, 'command_engine'):
+            self.command_engine.close()
+    
+    async def _main_loop(self):
+        """Main monitoring and alert loop
+        
+        The scanner polls on its own task and queues new CVEs while a single
+        worker alerts on them one at a time, so a long voice conversation no
+        longer holds up the next scan. Summaries are generated as soon as a
+        CVE is queued, so they are ready by the time the worker reaches it.
+        """
+        self._shutdown = asyncio.Event()
+        self._summary_slots = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+        
+        # Setup signal handlers
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._signal_handler, sig, None)
+            except NotImplementedError:
+                # Windows event loops cannot install signal handlers
+                signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(self._signal_handler, signum, frame))
+        
+        cve_queue: asyncio.Queue = asyncio.Queue()
+        tasks = [
+            asyncio.create_task(self._scanner_loop(cve_queue)),
+            asyncio.create_task(self._alert_worker(cve_queue))
+        ]
+        
+        try:
+            await self._shutdown.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.summarizer.aclose()
     
-    def _main_loop(self):
-        """Main monitoring and alert loop"""
+    async def _scanner_loop(self, cve_queue: asyncio.Queue):
+        """Poll for new CVEs and queue them for alerting
+        
+        Args:
+            cve_queue: Queue consumed by the alert worker
+        """
         while self.running:
             try:
                 logger.info("Scanning for new vulnerabilities...")
                 
                 # Scan for new CVEs
-                new_cves = self.scanner.fetch_new_cves()
+                new_cves = await asyncio.to_thread(self.scanner.fetch_new_cves)
                 
                 if not new_cves:
                     logger.info("No new CVEs found")
-                    time.sleep(self.poll_interval)
-                    continue
                 
-                # Process each CVE
                 for cve_raw in new_cves:
-                    if not self.running:
-                        break
-                        
-                    self._process_vulnerability(cve_raw)
+                    self._queue_vulnerability(cve_raw, cve_queue)
                 
                 # Wait before next scan
-                if self.running:
-                    logger.info(f"Waiting {self.poll_interval} seconds until next scan...")
-                    time.sleep(self.poll_interval)
+                logger.info(f"Waiting {self.poll_interval} seconds until next scan...")
+                await asyncio.sleep(self.poll_interval)
                 
             except Exception as e:
                 logger.error(f"Error in main loop: {e}")
-                time.sleep(60)  # Wait 1 minute before retrying
+                await asyncio.sleep(60)  # Wait 1 minute before retrying
+    
+    def _queue_vulnerability(self, cve_raw: Dict, cve_queue: asyncio.Queue):
+        """Queue a newly seen, affecting CVE and start summarizing it
+        
+        Args:
+            cve_raw: Raw CVE data from scanner
+            cve_queue: Queue consumed by the alert worker
+        """
+        try:
+            cve_info = self.scanner.extract_cve_info(cve_raw)
+            cve_id = cve_info["cve_id"]
+            
+            if cve_id in self._seen_cves:
+                logger.debug(f"{cve_id} already seen, skipping")
+                return
+            if len(self._seen_cves) >= SEEN_CVES_MAX:
+                del self._seen_cves[next(iter(self._seen_cves))]
+            self._seen_cves[cve_id] = None
+            
+            logger.info(f"Processing vulnerability: {cve_id}")
+            
+            if not self.scanner.is_affected_system(cve_info):
+                logger.info(f"System not affected by {cve_id}, skipping")
+                return
+            
+            logger.warning(f"CRITICAL: System affected by {cve_id}")
+            
+            summary = asyncio.create_task(self._summarize(cve_info))
+            cve_queue.put_nowait((cve_info, summary))
+            
+        except Exception as e:
+            logger.error(f"Error processing vulnerability: {e}")
+    
+    async def _summarize(self, cve_info: Dict) -> str:
+        """Generate a summary, at most SUMMARY_CONCURRENCY at a time"""
+        async with self._summary_slots:
+            return await self.summarizer.agenerate_summary(cve_info)
+    
+    async def _alert_worker(self, cve_queue: asyncio.Queue):
+        """Alert on queued CVEs one at a time (there is one engineer to talk to)
+        
+        Args:
+            cve_queue: Queue filled by the scanner loop
+        """
+        while self.running:
+            cve_info, summary = await cve_queue.get()
+            await self._process_vulnerability_async(cve_info, summary)
+    
+    async def _process_vulnerability_async(self, cve_info: Dict, summary: "asyncio.Task[str]"):
+        """Async variant of _process_vulnerability
+        
+        Args:
+            cve_info: Normalized CVE information
+            summary: Task generating the CVE summary, started when queued
+        """
+        try:
+            cve_id = cve_info["cve_id"]
+            
+            summary = await summary
+            voice_script = self.summarizer.generate_voice_script(summary, cve_id)
+            
+            # Voice I/O blocks on the microphone/speaker, keep it off the loop
+            await self._send_alert_in_thread(cve_id, voice_script)
+            
+        except Exception as e:
+            logger.error(f"Error processing vulnerability: {e}")
+    
+    async def _send_alert_in_thread(self, cve_id: str, voice_script: str):
+        """Run _send_alert on a daemon thread and wait for it
+        
+        Not asyncio.to_thread: asyncio.run() joins the default executor on
+        exit, so Ctrl+C would hang until the engineer finished talking. A
+        daemon thread is abandoned at exit instead, and if stop() arrives
+        mid-conversation it closes the voice clients once _send_alert returns.
+        
+        Args:
+            cve_id: CVE identifier being alerted on
+            voice_script: Script to speak
+        """
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        
+        def settle(error: Optional[BaseException]):
+            if done.done():
+                return
+            if error is None:
+                done.set_result(None)
+            else:
+                done.set_exception(error)
+        
+        def run():
+            error = None
+            try:
+                self._send_alert(cve_id, voice_script)
+            except BaseException as e:
+                error = e
+            finally:
+                with self._voice_lock:
+                    self._voice_thread = None
+                    stopped = not self.running
+                if stopped:
+                    self._close_clients()
+            try:
+                loop.call_soon_threadsafe(settle, error)
+            except RuntimeError:
+                pass  # loop already closed on shutdown
+        
+        with self._voice_lock:
+            if not self.running:
+                return
+            self._voice_thread = threading.Thread(target=run, name=f"voice-alert-{cve_id}", daemon=True)
+            self._voice_thread.start()
+        await done
     
     def _process_vulnerability(self, cve_raw: Dict):
         """Process a single vulnerability detection
@@ -147,32 +329,41 @@ class VoiceAlertSystem:
             # Create voice script
             voice_script = self.summarizer.generate_voice_script(summary, cve_id)
             
-            # Setup command handler for this CVE
-            command_callback = lambda cmd: self.command_engine.process_voice_command(cmd, cve_id)
-            
-            # Send alert via appropriate interface
-            if self.use_microphone:
-                # Use microphone interface
-                logger.info(f"Starting voice conversation for {cve_id}")
-                result = self.voice_interface.start_conversation(voice_script, command_callback)
-                logger.info(f"Voice conversation completed for {cve_id}: {result}")
-            else:
-                # Use phone caller (legacy)
-                call_id = self.voice_caller.place_call(
-                    phone_number=self.engineer_phone,
-                    script=voice_script,
-                    command_callback=command_callback
-                )
-                
-                if call_id:
-                    logger.info(f"Alert call placed for {cve_id}, call ID: {call_id}")
-                    self._monitor_call(call_id, cve_id)
-                else:
-                    logger.error(f"Failed to place alert call for {cve_id}")
+            self._send_alert(cve_id, voice_script)
             
         except Exception as e:
             logger.error(f"Error processing vulnerability: {e}")
     
+    def _send_alert(self, cve_id: str, voice_script: str):
+        """Deliver a voice alert and handle the engineer's commands
+        
+        Args:
+            cve_id: CVE identifier being alerted on
+            voice_script: Script to speak
+        """
+        # Setup command handler for this CVE
+        command_callback = lambda cmd: self.command_engine.process_voice_command(cmd, cve_id)
+        
+        # Send alert via appropriate interface
+        if self.use_microphone:
+            # Use microphone interface
+            logger.info(f"Starting voice conversation for {cve_id}")
+            result = self.voice_interface.start_conversation(voice_script, command_callback)
+            logger.info(f"Voice conversation completed for {cve_id}: {result}")
+        else:
+            # Use phone caller (legacy)
+            call_id = self.voice_caller.place_call(
+                phone_number=self.engineer_phone,
+                script=voice_script,
+                command_callback=command_callback
+            )
+            
+            if call_id:
+                logger.info(f"Alert call placed for {cve_id}, call ID: {call_id}")
+                self._monitor_call(call_id, cve_id)
+            else:
+                logger.error(f"Failed to place alert call for {cve_id}")
+    
     def _monitor_call(self, call_id: str, cve_id: str, timeout: int = 300):
         """Monitor an active call for responses
         
@@ -181,13 +372,13 @@ class VoiceAlertSystem:
             cve_id: Associated CVE ID
             timeout: Maximum time to monitor call
         """
-        start_time = time.time()
+        start_time = time.monotonic()
         
         logger.info(f"Monitoring call {call_id} for {cve_id}")
         
         # In a real implementation, this would monitor webhooks or poll call status
         # For now, we'll simulate monitoring
-        while time.time() - start_time < timeout:
+        while time.monotonic() - start_time < timeout:
             if not self.running:
                 break
                 
@@ -197,7 +388,7 @@ class VoiceAlertSystem:
                 logger.info(f"Call {call_id} ended")
                 break
             
-            time.sleep(10)  # Check every 10 seconds
+            self._wake.wait(10)  # Check every 10 seconds
         
         # Cleanup
         if hasattr(self, 'voice_caller'):
@@ -251,10 +442,11 @@ class VoiceAlertSystem:
 def main():
     """Main entry point"""
     try:
-        system = VoiceAlertSystem()
+        # --recalibrate: sample ambient noise again instead of the saved calibration
+        system = VoiceAlertSystem(force_recalibrate="--recalibrate" in os.sys.argv[1:])
         
         # Check if we should run in test mode
-        if len(os.sys.argv) > 1 and os.sys.argv[1] == "--test":
+        if "--test" in os.sys.argv[1:]:
             logger.info("Running in test mode")
             system.process_single_cve()
         else: